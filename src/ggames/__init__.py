@@ -1,6 +1,9 @@
-import sys, argparse, logging, errno
+import sys, os, argparse, logging, errno, signal
 import json, re, itertools
+import concurrent.futures
 from . import cops_robbers_game as crg
+from . import reachability_game
+from . import cache as result_cache
 
 
 PROGRAM_NAME = 'GGames'
@@ -18,6 +21,9 @@ or if the file exists and cannot be overwritten.'''
 ERROR_OPENING_GRAPH_FILE_MSG = \
 '''The file containing the graph cannot be opened. Check if the file exists
 and if the permission of reading is granted.'''
+ERROR_RESUMING_MSG = \
+'''The job cannot be resumed. Check if the directory was given to --work-dir
+by a previous run.'''
 
 
 def _extract_graph(graph_str):
@@ -51,29 +57,229 @@ def _extract_graph(graph_str):
     return V, E
 
 
+def _iter_batch_items(paths):
+    """
+    Generate the pairs (name, graph_str) of the graphs of a batch. A path is
+    either a JSon file, a JSon-lines file (extension '.jsonl', or '-' for the
+    standard input) with one graph per line, or a directory whose JSon and
+    JSon-lines files are read in the order of their names. If a file cannot
+    be read, the "OSError" is generated in place of the graph.
+    :param paths: A list of paths
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            yield from _iter_batch_items(sorted(os.path.join(path, name)
+                    for name in os.listdir(path)
+                    if name.endswith(('.json', '.jsonl'))))
+        elif path == '-':
+            for line_number, line in enumerate(sys.stdin, 1):
+                if line.strip():
+                    yield f'<stdin>:{line_number}', line
+        else:
+            try:
+                with open(path, 'r') as file:
+                    if not path.endswith('.jsonl'):
+                        yield path, file.read()
+                        continue
+                    for line_number, line in enumerate(file, 1):
+                        if line.strip():
+                            yield f'{path}:{line_number}', line
+            except OSError as error:
+                yield path, error
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError('The time limit has been exceeded.')
+
+
+def _solve_batch_item(name, graph_str, k, cop_number, timeout, cache_path,
+        cache_size, max_rounds):
+    """
+    Solve one graph of a batch in a worker process, and return its result as
+    a dict. The errors are reported in the dict instead of being raised.
+    :param name: The name of the graph in the batch
+    :param graph_str: A graph in JSon format, or the "OSError" raised when
+        reading it
+    :param k: The number of cops, or the largest number of cops tried if
+        "cop_number" is set
+    :param cop_number: A flag to compute the cop number instead
+    :param timeout: The time limit in seconds, or None
+    :param cache_path: The path to the SQLite file of the results, or None
+    :param cache_size: The largest number of results kept in the cache
+    :param max_rounds: The largest number of moves of the cops, or None
+    """
+    if isinstance(graph_str, OSError):
+        return {'name': name, 'error': f'{ERROR_OPENING_GRAPH_FILE_MSG}\n'\
+                f'{graph_str.strerror}'}
+    if timeout is not None:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    cache = None
+    try:
+        graph = _extract_graph(graph_str)
+        tau = graph[2] if len(graph) == 3 else None
+        if cop_number:
+            result = crg.cop_number(graph[0], graph[1], tau=tau, max_k=k)
+        else:
+            if cache_path is not None:
+                cache = result_cache.ResultCache(cache_path, cache_size)
+            result = crg.is_kcop_win(graph[0], graph[1], tau=tau, k=k,
+                    cache=cache, max_rounds=max_rounds)
+    except json.JSONDecodeError as error:
+        return {'name': name, 'error': f'{ERROR_JSON_MSG}\n{error}'}
+    except (ValueError, KeyError, TypeError, TimeoutError) as error:
+        return {'name': name, 'error': str(error)}
+    finally:
+        if timeout is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if cache is not None:
+            cache.close()
+    if cache is not None:
+        return {'name': name, 'result': result, 'cached': cache.hits > 0}
+    return {'name': name, 'result': result}
+
+
+def _run_batch(paths, k, cop_number, workers, timeout, cache_path,
+        cache_size, max_rounds, output):
+    """
+    Solve the graphs of a batch on a pool of "workers" processes, and write
+    their results to "output" as JSon lines in the order of completion. At
+    most a few graphs per worker are read ahead, so a long stream is not
+    loaded in memory.
+    :param paths: A list of paths (see "_iter_batch_items")
+    :param k: The number of cops, or the largest number of cops tried if
+        "cop_number" is set
+    :param cop_number: A flag to compute the cop number instead
+    :param workers: The number of worker processes, or None for the number
+        of processors
+    :param timeout: The time limit in seconds of each graph, or None
+    :param cache_path: The path to the SQLite file of the results, or None
+    :param cache_size: The largest number of results kept in the cache
+    :param max_rounds: The largest number of moves of the cops, or None
+    :param output: A writable file
+    """
+    logger = logging.getLogger('main')
+    if workers is None: workers = os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        max_pending = 4 * workers
+        pending = dict()
+        hits = 0; misses = 0
+        items = _iter_batch_items(paths)
+        while True:
+            for name, graph_str in itertools.islice(items,
+                    max_pending - len(pending)):
+                pending[executor.submit(_solve_batch_item, name,
+                        graph_str, k, cop_number, timeout, cache_path,
+                        cache_size, max_rounds)] = name
+            if len(pending) == 0:
+                break
+            done, _ = concurrent.futures.wait(pending,
+                    return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as error:
+                    # Any other error of a graph, even from a worker that
+                    # died, is reported as its own result.
+                    result = {'name': name,
+                            'error': f'{type(error).__name__}: {error}'}
+                if 'cached' in result:
+                    hits += result['cached']; misses += not result['cached']
+                output.write(json.dumps(result) + '\n')
+            output.flush()
+    if cache_path is not None:
+        logger.info(f'Cache: {hits} hits, {misses} misses.')
+
+
 def kcop_win(arg_list):
     parser = argparse.ArgumentParser(
             prog=PROGRAM_NAME,
             description=PROGRAM_DESCRIPTION)
-    parser.add_argument('k', type=int, help=
-            'The number of cops in the game.')
-    parser.add_argument('graph_file_path', help=
+    parser.add_argument('k', nargs='?', help=
+            'The number of cops in the game. With --cop-number, the largest '\
+            'number of cops tried.')
+    parser.add_argument('graph_file_path', nargs='?', help=
             'The path to the file containing the description of the graph.')
     parser.add_argument('--output_path', '-o',
             help='Specify the path to the output file containing the presence'\
             ' mapping of the k-cop-win graph.')
+    parser.add_argument('--cop-number', action='store_true', help=
+            'Output the cop number of the graph, or None if it is larger '\
+            'than k.')
+    parser.add_argument('--batch', nargs='+', metavar='PATH', help=
+            'Solve the graphs of JSon files, of JSon-lines files (.jsonl, '\
+            'or - for the standard input) and of directories, and output '\
+            'one JSon line per graph in the order of completion.')
+    parser.add_argument('--workers', type=int, help=
+            'The number of worker processes of --batch. Defaults to the '\
+            'number of processors.')
+    parser.add_argument('--timeout', type=float, help=
+            'The time limit in seconds of each graph of --batch.')
+    parser.add_argument('--max-rounds', type=int, metavar='T', help=
+            'Decide if the cops capture the robber within T moves.')
+    parser.add_argument('--cache', metavar='PATH', help=
+            'The path to a SQLite file where the results are kept, so that '\
+            'a graph submitted again, even relabelled, is not solved again.')
+    parser.add_argument('--cache-size', type=int,
+            default=result_cache.MAX_ENTRIES, help=
+            'The largest number of results kept in --cache.')
+    parser.add_argument('--work-dir', metavar='DIR', help=
+            'A directory where the game graph is kept in memory-mapped '\
+            'files, so that it does not have to fit in memory. The files '\
+            'are reused by the next runs on the same graph, and the solve '\
+            'is checkpointed in this directory.')
+    parser.add_argument('--checkpoint-interval', type=float,
+            metavar='SECONDS',
+            default=reachability_game.CHECKPOINT_INTERVAL, help=
+            'The smallest number of seconds between two checkpoints in '\
+            '--work-dir.')
+    parser.add_argument('--resume', metavar='DIR', help=
+            'Continue the job of --work-dir DIR from its last checkpoint.')
     parser.add_argument('--verbose', '-v', action='store_true', help=
             'Output more information.')
     parser.add_argument('--version', action='version', help=
             'Show the current version of the program.',
             version=f'%(prog)s {VERSION}')
     parsed_args = parser.parse_args(args=arg_list)
+    # Both positional arguments are optional, so a lone graph file path is
+    # parsed as k.
+    if parsed_args.graph_file_path is None and parsed_args.k is not None \
+            and re.fullmatch('[+-]?[0-9]+', parsed_args.k) is None:
+        parsed_args.graph_file_path = parsed_args.k
+        parsed_args.k = None
+    if parsed_args.k is not None:
+        try:
+            parsed_args.k = int(parsed_args.k)
+        except ValueError:
+            parser.error(f'argument k: invalid int value: '\
+                    f'\'{parsed_args.k}\'')
+    if parsed_args.resume is not None:
+        if parsed_args.k is not None or parsed_args.graph_file_path \
+                is not None or parsed_args.batch is not None \
+                or parsed_args.cop_number or parsed_args.work_dir is not None:
+            parser.error('--resume cannot be used with k, graph_file_path, '\
+                    '--batch, --cop-number or --work-dir')
+    else:
+        if parsed_args.k is None and not parsed_args.cop_number:
+            parser.error('the following arguments are required: k')
+        if (parsed_args.graph_file_path is None) \
+                == (parsed_args.batch is None):
+            parser.error('exactly one of graph_file_path and --batch is '\
+                    'required')
+    if parsed_args.work_dir is not None and (parsed_args.batch is not None
+            or parsed_args.cop_number):
+        parser.error('--work-dir cannot be used with --batch or '\
+                '--cop-number')
     
     logger = logging.getLogger('main')
     if parsed_args.verbose:
-        # Activate the logger.
+        # Activate the logger. The results of a batch are JSon lines on the
+        # standard output, so its logs, and those of its workers, go to the
+        # standard error.
         logger.setLevel(logging.INFO)
-        logger_handler = logging.StreamHandler(stream=sys.stdout)
+        logger_handler = logging.StreamHandler(stream=sys.stderr
+                if parsed_args.batch is not None else sys.stdout)
         logger_handler.setLevel(logging.INFO)
         logger.addHandler(logger_handler)
     
@@ -89,18 +295,36 @@ def kcop_win(arg_list):
     else:
         output = sys.stdout
     
+    if parsed_args.batch is not None:
+        _run_batch(parsed_args.batch, parsed_args.k, parsed_args.cop_number,
+                parsed_args.workers, parsed_args.timeout, parsed_args.cache,
+                parsed_args.cache_size, parsed_args.max_rounds, output)
+        exit(0)
+
     # Get the graph
     logger.info('Loading the graph...')
     try:
-        file = open(parsed_args.graph_file_path, 'r')
-        graph_str = file.read()
-        file.close()
+        if parsed_args.resume is not None:
+            # The job of the work directory is run again, and its files are
+            # resumed.
+            with open(os.path.join(parsed_args.resume, 'job.json'), 'r') \
+                    as file:
+                job = json.load(file)
+            graph_str = job['graph']
+            parsed_args.k = job['k']
+            parsed_args.max_rounds = job['max_rounds']
+            parsed_args.work_dir = parsed_args.resume
+        else:
+            file = open(parsed_args.graph_file_path, 'r')
+            graph_str = file.read()
+            file.close()
         graph = _extract_graph(graph_str)
     except OSError as error:
-        sys.stderr.write(f'{ERROR_OPENING_GRAPH_FILE_MSG}\n'\
-                f'{error.strerror}')
+        message = ERROR_OPENING_GRAPH_FILE_MSG if parsed_args.resume is None \
+                else ERROR_RESUMING_MSG
+        sys.stderr.write(f'{message}\n{error.strerror}')
         exit(error.errno)
-    except json.JSONDecodeError as error:
+    except (json.JSONDecodeError, KeyError) as error:
         sys.stderr.write(f'{ERROR_JSON_MSG}\n{error}')
         exit(errno.EINVAL)
     except ValueError as error:
@@ -108,8 +332,30 @@ def kcop_win(arg_list):
         exit(errno.EINVAL)
     logger.info('Graph loaded.')
 
-    result = crg.is_kcop_win(graph[0], graph[1],
-            tau=graph[2] if len(graph) == 3 else None, k=parsed_args.k)
+    if parsed_args.cop_number:
+        result = crg.cop_number(graph[0], graph[1],
+                tau=graph[2] if len(graph) == 3 else None,
+                max_k=parsed_args.k)
+    else:
+        if parsed_args.work_dir is not None and parsed_args.resume is None:
+            # The job is written first, so that it can be resumed.
+            os.makedirs(parsed_args.work_dir, exist_ok=True)
+            with open(os.path.join(parsed_args.work_dir, 'job.json'), 'w') \
+                    as file:
+                json.dump({'graph': graph_str, 'k': parsed_args.k,
+                        'max_rounds': parsed_args.max_rounds}, file)
+        cache = None
+        if parsed_args.cache is not None:
+            cache = result_cache.ResultCache(parsed_args.cache,
+                    parsed_args.cache_size)
+        result = crg.is_kcop_win(graph[0], graph[1],
+                tau=graph[2] if len(graph) == 3 else None, k=parsed_args.k,
+                cache=cache, max_rounds=parsed_args.max_rounds,
+                directory=parsed_args.work_dir,
+                checkpoint_interval=parsed_args.checkpoint_interval)
+        if cache is not None:
+            logger.info(f'Cache: {cache.hits} hits, {cache.misses} misses.')
+            cache.close()
     output.write(f'{result}\n')
     output.flush()
     exit(0)
@@ -0,0 +1,279 @@
+"""
+An automorphism of an edge periodic (or static) graph (V, E, tau) is a
+permutation of V that maps every edge to an edge with the same presence
+pattern. The automorphisms are found by a refinement and backtracking search
+which individualizes the vertices one by one, as in the usual algorithms of
+graph isomorphism.
+The vertices are given by their indices in V, and an automorphism is a list
+"g" where g[i] is the index of the image of V[i].
+"""
+
+
+import logging
+import math
+import functools, collections
+
+
+# The default largest number of leaves visited by "get_canonical_labelling".
+MAX_LEAVES = 1000
+
+
+def _get_colored_adjacency(V, E, tau=None):
+    """
+    Compute, for every vertex, a dict that maps the indices of its
+    neighbours to the colour of the edge between them. Two edges have the
+    same colour if and only if they have the same presence function. The
+    colours only depend on the presence patterns, not on the labels of the
+    vertices.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    """
+    if tau is None: tau = {e: '1' for e in E}
+
+    pattern_lengths = list(map(len, tau.values()))
+    time_horizon = functools.reduce(lambda x,y: abs(x*y) // math.gcd(x,y),
+            pattern_lengths, 1)
+    # The patterns are unrolled over the time horizon to compare them.
+    unrolled = {e: edge_pattern * (time_horizon // len(edge_pattern))
+            for e, edge_pattern in tau.items()}
+    colors = {edge_pattern: color for color, edge_pattern
+            in enumerate(sorted(set(unrolled.values())))}
+
+    vertex_index = {u: index for index, u in enumerate(V)}
+    adjacency = [dict() for _ in V]
+    for (u, v), edge_pattern in unrolled.items():
+        i = vertex_index[u]; j = vertex_index[v]
+        if i == j or '1' not in edge_pattern:
+            continue
+        adjacency[i][j] = colors[edge_pattern]
+        adjacency[j][i] = colors[edge_pattern]
+    return adjacency
+
+
+def _refine(adjacency, colors):
+    """
+    Refine the colouring "colors" of the vertices until it is equitable:
+    two vertices of the same colour have, for every colour of edge and of
+    vertex, the same number of such neighbours. The new colours are the
+    ranks of the signatures of the vertices, so the refinement commutes with
+    the relabelling of the vertices.
+    :param adjacency: The coloured adjacency (see "_get_colored_adjacency")
+    :param colors: A list of integers
+    """
+    num_colors = len(set(colors))
+    while True:
+        signatures = [(colors[i], tuple(sorted((edge_color, colors[j])
+                for j, edge_color in adjacency[i].items())))
+                for i in range(len(colors))]
+        ranks = {signature: rank for rank, signature
+                in enumerate(sorted(set(signatures)))}
+        colors = [ranks[signature] for signature in signatures]
+        if len(ranks) == num_colors:
+            return colors
+        num_colors = len(ranks)
+
+
+def _individualize(adjacency, colors, v):
+    """
+    Give its own colour to the vertex "v", then refine the colouring.
+    :param adjacency: The coloured adjacency (see "_get_colored_adjacency")
+    :param colors: An equitable colouring
+    :param v: The index of a vertex
+    """
+    return _refine(adjacency, [2*color + (color == colors[v] and i != v)
+            for i, color in enumerate(colors)])
+
+
+def _get_target_cell(colors):
+    """
+    Compute the list of the vertices of the smallest colour shared by
+    several vertices, or None if the colouring is discrete.
+    :param colors: A list of integers
+    """
+    counts = collections.Counter(colors)
+    shared = [color for color, count in counts.items() if count > 1]
+    if len(shared) == 0:
+        return None
+    target = min(shared)
+    return [i for i, color in enumerate(colors) if color == target]
+
+
+def _is_automorphism(adjacency, g):
+    """
+    Compute if the permutation "g" preserves the coloured adjacency.
+    :param adjacency: The coloured adjacency (see "_get_colored_adjacency")
+    :param g: A permutation of the indices of the vertices
+    """
+    for i, neighbours in enumerate(adjacency):
+        image_neighbours = adjacency[g[i]]
+        if len(neighbours) != len(image_neighbours):
+            return False
+        for j, edge_color in neighbours.items():
+            if image_neighbours.get(g[j]) != edge_color:
+                return False
+    return True
+
+
+def _find_automorphism(adjacency, colors, path, depth):
+    """
+    Search the subtree of the colouring "colors" for a leaf that is the
+    image of the leaf of "path" by an automorphism, and return this
+    automorphism. Return None if there is none.
+    :param adjacency: The coloured adjacency (see "_get_colored_adjacency")
+    :param colors: An equitable colouring at the depth "depth"
+    :param path: The colourings of the first path of the search tree
+    :param depth: The depth of "colors" in the search tree
+    """
+    # The colours are canonical, so an automorphism maps the colouring of
+    # the first path to a colouring with the same colour classes' sizes.
+    if sorted(colors) != sorted(path[depth]):
+        return None
+    cell = _get_target_cell(colors)
+    if cell is None:
+        leaf = path[-1]
+        vertex_of_color = [0] * len(colors)
+        for i, color in enumerate(colors):
+            vertex_of_color[color] = i
+        g = [vertex_of_color[leaf[i]] for i in range(len(colors))]
+        return g if _is_automorphism(adjacency, g) else None
+    for u in cell:
+        g = _find_automorphism(adjacency,
+                _individualize(adjacency, colors, u), path, depth + 1)
+        if g is not None:
+            return g
+    return None
+
+
+def _get_first_path(adjacency):
+    """
+    Compute the first path of the search tree, where the first vertex of the
+    target cell is individualized at every level. Return the colourings
+    along the path and the individualized vertices, called the base.
+    :param adjacency: The coloured adjacency (see "_get_colored_adjacency")
+    """
+    path = [_refine(adjacency, [0] * len(adjacency))]
+    base = []
+    while True:
+        cell = _get_target_cell(path[-1])
+        if cell is None:
+            return path, base
+        base.append(cell[0])
+        path.append(_individualize(adjacency, path[-1], cell[0]))
+
+
+def _get_leveled_generators(adjacency, path, base):
+    """
+    Compute the generators of the group of the automorphisms with their
+    levels: the generators of the level "level" and of the deeper levels fix
+    the vertices base[:level], and generate the group of the automorphisms
+    that fix them.
+    :param adjacency: The coloured adjacency (see "_get_colored_adjacency")
+    :param path: The colourings of the first path (see "_get_first_path")
+    :param base: The base of the first path (see "_get_first_path")
+    """
+    generators = []
+    for level in reversed(range(len(base))):
+        v = base[level]; colors = path[level]
+        orbit = get_orbit(v, [g for _, g in generators])
+        for w in range(len(adjacency)):
+            if colors[w] != colors[v] or w in orbit:
+                continue
+            g = _find_automorphism(adjacency,
+                    _individualize(adjacency, colors, w), path, level + 1)
+            if g is not None:
+                generators.append((level, g))
+                orbit = get_orbit(v, [g for _, g in generators])
+    return generators
+
+
+def get_orbit(v, generators):
+    """
+    Compute the orbit of the index "v" under the group generated by the
+    permutations "generators".
+    :param v: The index of a vertex
+    :param generators: A list of permutations
+    """
+    orbit = {v}
+    stack = [v]
+    while len(stack) > 0:
+        u = stack.pop()
+        for g in generators:
+            if g[u] not in orbit:
+                orbit.add(g[u])
+                stack.append(g[u])
+    return orbit
+
+
+def get_automorphisms(V, E, tau=None):
+    """
+    Compute a set of generators of the group of the automorphisms of the
+    edge periodic graph (V, E, tau), that is the permutations of V that
+    preserve the edges and their presence patterns. If "tau" is not
+    specified, then the graph is considered to be static.
+    The generators are found along the first path of the search tree: for
+    every vertex individualized on this path, one automorphism is searched
+    for every other vertex of its cell that is not yet in its orbit.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    """
+    logger = logging.getLogger('main.automorphisms')
+    logger.info('"automorphisms.get_automorphisms" called.')
+
+    adjacency = _get_colored_adjacency(V, E, tau)
+    path, base = _get_first_path(adjacency)
+    return [g for _, g in _get_leveled_generators(adjacency, path, base)]
+
+
+def get_canonical_labelling(V, E, tau=None, max_leaves=MAX_LEAVES):
+    """
+    Compute a canonical labelling of the edge periodic graph (V, E, tau):
+    a list "labelling" where labelling[i] is the new index of V[i], such that
+    two isomorphic graphs have the same relabelled graph. The relabelled
+    graph of each leaf of the search tree is compared, and the smallest one
+    is kept. The subtrees of the first path are pruned by the orbits of the
+    automorphisms that fix the vertices individualized before.
+    If the search visits more than "max_leaves" leaves, then the best leaf
+    found is returned: the labelling is still a relabelling, but it may
+    depend on the order of V. The second returned value tells if the search
+    was complete.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    :param max_leaves: The largest number of leaves visited
+    """
+    adjacency = _get_colored_adjacency(V, E, tau)
+    path, base = _get_first_path(adjacency)
+    generators = _get_leveled_generators(adjacency, path, base)
+
+    best = None; num_leaves = 0
+    # The nodes to explore are pairs (colors, depth), where depth is None off
+    # the first path.
+    stack = [(path[0], 0)]
+    while len(stack) > 0:
+        colors, depth = stack.pop()
+        cell = _get_target_cell(colors)
+        if cell is None:
+            num_leaves += 1
+            certificate = sorted((min(colors[i], colors[j]),
+                    max(colors[i], colors[j]), edge_color)
+                    for i, neighbours in enumerate(adjacency)
+                    for j, edge_color in neighbours.items() if i < j)
+            if best is None or certificate < best[0]:
+                best = certificate, colors
+            if num_leaves >= max_leaves and len(stack) > 0:
+                return best[1], False
+            continue
+        stabilizer = [g for level, g in generators
+                if depth is not None and level >= depth]
+        children = []; covered = set()
+        for u in cell:
+            if u not in covered:
+                children.append(u)
+                covered |= get_orbit(u, stabilizer)
+        for u in reversed(children):
+            on_path = depth is not None and u == base[depth]
+            stack.append((_individualize(adjacency, colors, u),
+                    depth + 1 if on_path else None))
+    return best[1], True
@@ -0,0 +1,145 @@
+"""
+The results of the Cops and Robbers game can be kept in a SQLite file, so that
+an instance submitted again is not solved again. The instances are keyed by a
+fingerprint of the normalized graph: the edges are unordered pairs, the
+presence patterns are primitive (see "structural.get_primitive_pattern")
+and the vertices are renumbered by a canonical labelling (see
+"automorphisms.get_canonical_labelling"), so relabelling the vertices or
+reordering the edges gives the same fingerprint.
+"""
+
+
+import math
+import hashlib, json
+import sqlite3
+from . import automorphisms
+from . import structural
+
+
+# The default largest number of results kept in a cache.
+MAX_ENTRIES = 100000
+
+
+def normalize_graph(V, E, tau=None):
+    """
+    Compute the normalized presence function of the edge periodic graph
+    (V, E, tau): a dict that maps every edge, oriented from the smaller index
+    in V to the larger one, to its primitive presence pattern. The edges
+    given twice are merged, and the loops and the edges that are never
+    present are removed, since they do not change the game.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    """
+    if tau is None: tau = {e: '1' for e in E}
+    vertex_index = {u: index for index, u in enumerate(V)}
+    patterns = dict()
+    for (u, v), edge_pattern in tau.items():
+        i = vertex_index[u]; j = vertex_index[v]
+        if i == j:
+            continue
+        e = (V[min(i, j)], V[max(i, j)])
+        if e in patterns:
+            # The edge is present when either pattern is.
+            previous = patterns[e]
+            length = abs(len(previous) * len(edge_pattern)) \
+                    // math.gcd(len(previous), len(edge_pattern))
+            edge_pattern = ''.join(max(previous[t % len(previous)],
+                    edge_pattern[t % len(edge_pattern)])
+                    for t in range(length))
+        patterns[e] = edge_pattern
+    return {e: structural.get_primitive_pattern(edge_pattern)
+            for e, edge_pattern in patterns.items() if '1' in edge_pattern}
+
+
+def get_fingerprint(V, E, tau=None, k=1, max_leaves=automorphisms.MAX_LEAVES):
+    """
+    Compute the fingerprint of the instance (V, E, tau, k) as a hexadecimal
+    SHA-256 digest. Two instances that only differ by a relabelling of the
+    vertices, the order or the orientation of the edges, or the repetition of
+    the presence patterns have the same fingerprint, unless the canonical
+    labelling visits more than "max_leaves" leaves. Two instances with the
+    same fingerprint are isomorphic, so they have the same result.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    :param k: The number of cops
+    :param max_leaves: The largest number of leaves visited by the canonical
+        labelling
+    """
+    normalized_tau = normalize_graph(V, E, tau)
+    labelling, _ = automorphisms.get_canonical_labelling(V,
+            list(normalized_tau), normalized_tau, max_leaves)
+    vertex_index = {u: index for index, u in enumerate(V)}
+    edges = sorted([*sorted((labelling[vertex_index[u]],
+            labelling[vertex_index[v]])), edge_pattern]
+            for (u, v), edge_pattern in normalized_tau.items())
+    instance = json.dumps({'n': len(V), 'k': k, 'E': edges})
+    return hashlib.sha256(instance.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    A cache of results stored in a SQLite file. When there are more than
+    "max_entries" results, the least recently used ones are evicted. The
+    numbers of hits and misses since the opening are counted.
+    :param path: The path to the SQLite file, created if it does not exist
+    :param max_entries: The largest number of results kept
+    """
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Several processes may share the file, so the writers wait for the
+        # lock instead of failing.
+        self._connection = sqlite3.connect(path, timeout=60)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS results ('\
+                    'fingerprint TEXT PRIMARY KEY, result TEXT NOT NULL, '\
+                    'last_used INTEGER NOT NULL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS '\
+                    'results_last_used ON results (last_used)')
+
+    def __len__(self):
+        return self._connection.execute(
+                'SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def _next_use(self):
+        return self._connection.execute('SELECT COALESCE(MAX(last_used), 0) '\
+                '+ 1 FROM results').fetchone()[0]
+
+    def get(self, fingerprint):
+        """
+        Compute the result of the instance of fingerprint "fingerprint", or
+        None if it is not in the cache.
+        :param fingerprint: A fingerprint (see "get_fingerprint")
+        """
+        row = self._connection.execute('SELECT result FROM results WHERE '\
+                'fingerprint = ?', (fingerprint,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._connection:
+            self._connection.execute('UPDATE results SET last_used = ? '\
+                    'WHERE fingerprint = ?', (self._next_use(), fingerprint))
+        return json.loads(row[0])
+
+    def put(self, fingerprint, result):
+        """
+        Store the result of the instance of fingerprint "fingerprint", and
+        evict the least recently used results if the cache is full.
+        :param fingerprint: A fingerprint (see "get_fingerprint")
+        :param result: A result that can be written in JSon
+        """
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO results VALUES '\
+                    '(?, ?, ?)', (fingerprint, json.dumps(result),
+                    self._next_use()))
+            self._connection.execute('DELETE FROM results WHERE fingerprint '\
+                    'IN (SELECT fingerprint FROM results ORDER BY last_used '\
+                    'DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+    def close(self):
+        self._connection.close()
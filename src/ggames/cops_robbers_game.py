@@ -5,88 +5,1432 @@ A Cops and Robbers game is played on an edge periodic (or static) graph
 
 
 import logging
-import math, copy
-import functools, itertools
+import os, time
+import math
+import hashlib, json, struct
+import functools, itertools, collections
+import array
+import concurrent.futures
+from multiprocessing import shared_memory
+import numpy as np
 from . import reachability_game
+from . import automorphisms as graph_automorphisms
+from . import structural
+from . import cache as result_cache
 
 
+class StateEncoder:
+    """
+    Number the vertices (*c, r, s, t) of the game graph with the mixed-radix
+    integer ((t*2 + s)*n + c_1)*n + ... + c_k)*n + r, where c_i and r are the
+    indices of the vertices in "V". The numbering follows the order in which
+    "get_game_graph" enumerates the vertices of the game graph.
+    If "symmetric" is set, the cops are interchangeable: a configuration of
+    the cops is the sorted tuple of their indices and is numbered by its rank
+    among the combinations with replacement of k indices.
+    :param V: The list of vertices
+    :param k: The number of cops in the game
+    :param time_horizon: The number of time steps of the game graph
+    :param symmetric: A flag to identify the permutations of the cops
+    """
+
+    def __init__(self, V, k, time_horizon, symmetric=False):
+        self.V = list(V)
+        self.k = k
+        self.time_horizon = time_horizon
+        self.symmetric = symmetric
+        self.n = len(self.V)
+        self.vertex_index = {u: index for index, u in enumerate(self.V)}
+        if symmetric:
+            self.cop_configurations = list(
+                    itertools.combinations_with_replacement(range(self.n), k))
+            self._cop_configuration_index = {c: index for index, c
+                    in enumerate(self.cop_configurations)}
+        else:
+            self.cop_configurations = list(
+                    itertools.product(range(self.n), repeat=k))
+        self.num_positions = len(self.cop_configurations) * self.n
+        self.num_states = 2 * time_horizon * self.num_positions
+
+    def __len__(self):
+        return self.num_states
+
+    def cop_configuration_index(self, c):
+        """
+        Compute the number of the configuration of the cops on the vertices
+        of indices "c".
+        :param c: A tuple of indices of vertices
+        """
+        if self.symmetric:
+            return self._cop_configuration_index[tuple(sorted(c))]
+        index = 0
+        for i in c:
+            index = index * self.n + i
+        return index
+
+    def encode_position(self, c, r):
+        """
+        Compute the number of the position where the cops are on the vertices
+        of indices "c" and the robber on the vertex of index "r".
+        :param c: A tuple of indices of vertices
+        :param r: The index of a vertex
+        """
+        return self.cop_configuration_index(c) * self.n + r
+
+    def decode_position(self, position):
+        """
+        Compute the indices (c, r) of the vertices of the cops and the robber
+        of the position numbered "position".
+        :param position: An integer between 0 and self.num_positions - 1
+        """
+        cop_configuration, r = divmod(position, self.n)
+        return self.cop_configurations[cop_configuration], r
+
+    def encode(self, vertex):
+        """
+        Compute the integer of a vertex (*c, r, s, t) of the game graph.
+        :param vertex: A vertex of the game graph as a tuple
+        """
+        *c, r, s, t = vertex
+        position = self.encode_position([self.vertex_index[u] for u in c],
+                self.vertex_index[r])
+        return (2*t + int(s)) * self.num_positions + position
+
+    def decode(self, index):
+        """
+        Compute the vertex (*c, r, s, t) of the game graph numbered "index".
+        :param index: An integer between 0 and len(self) - 1
+        """
+        layer, position = divmod(int(index), self.num_positions)
+        t, s = divmod(layer, 2)
+        c, r = self.decode_position(position)
+        return (*(self.V[i] for i in c), self.V[r], bool(s), t)
+
+    def expand_positions(self, values):
+        """
+        Compute the array of the values of every position (*c, r) numbered
+        as in "StateEncoder", from an array of "values" indexed by the
+        positions of this encoder.
+        :param values: A NumPy array of length self.num_positions
+        """
+        return values
+
+    def captured_positions(self):
+        """
+        Compute a boolean array telling, for each position (*c, r) numbered
+        as in "encode", if the robber shares its vertex with a cop.
+        """
+        cops = np.array(self.cop_configurations, dtype=np.int64) \
+                .reshape(-1, self.k)
+        return (cops[:, :, None] == np.arange(self.n)).any(axis=1).ravel()
+
+
+class QuotientStateEncoder(StateEncoder):
+    """
+    Number the orbits of the vertices of the game graph under a group of
+    automorphisms of (V, E, tau) acting on the cops and the robber. Each
+    orbit of positions (*c, r) is represented by its smallest position in
+    the numbering of "StateEncoder", and the integer of a vertex
+    (*c, r, s, t) is (t*2 + s)*m + q where q is the rank of the orbit among
+    the m orbits.
+    :param V: The list of vertices
+    :param k: The number of cops in the game
+    :param time_horizon: The number of time steps of the game graph
+    :param symmetric: A flag to identify the permutations of the cops
+    :param generators: The permutations generating the group (see
+        "automorphisms.get_automorphisms")
+    """
+
+    def __init__(self, V, k, time_horizon, symmetric, generators):
+        super().__init__(V, k, time_horizon, symmetric)
+        self.generators = generators
+        labels = self._get_orbit_labels()
+        self.representatives, self.position_classes = np.unique(labels,
+                return_inverse=True)
+        self.num_positions = len(self.representatives)
+        self.num_states = 2 * time_horizon * self.num_positions
+
+    def _get_orbit_labels(self):
+        """
+        Compute, for every position of "StateEncoder", the smallest position
+        of its orbit.
+        """
+        n = self.n
+        cops = np.array(self.cop_configurations, dtype=np.int64) \
+                .reshape(-1, self.k)
+        weights = n ** np.arange(self.k - 1, -1, -1, dtype=np.int64)
+        keys = cops @ weights
+        labels = np.arange(len(cops) * n, dtype=np.int64)
+        images = []
+        for g in self.generators:
+            g = np.array(g, dtype=np.int64)
+            image_cops = g[cops]
+            if self.symmetric:
+                image_cops.sort(axis=1)
+                # The configurations are in lexicographic order.
+                image_configurations = np.searchsorted(keys,
+                        image_cops @ weights)
+            else:
+                image_configurations = image_cops @ weights
+            images.append((image_configurations[:, None] * n
+                    + g[None, :]).ravel())
+
+        # Propagate the smallest position along the generators.
+        while True:
+            previous_labels = labels
+            for image in images:
+                labels = np.minimum(labels, labels[image])
+            labels = labels[labels]
+            if np.array_equal(labels, previous_labels):
+                return labels
+
+    def encode_position(self, c, r):
+        return self.position_classes[super().encode_position(c, r)]
 
-def get_game_graph(V, E, tau=None, k=1):
+    def decode_position(self, position):
+        return super().decode_position(self.representatives[position])
+
+    def expand_positions(self, values):
+        return values[self.position_classes]
+
+    def captured_positions(self):
+        return super().captured_positions()[self.representatives]
+
+
+def compress_time_horizon(E, tau=None):
+    """
+    Compute the presence function "tau" where every pattern is replaced by
+    its primitive pattern, and the time horizons before and after this
+    compression. Two time steps whose snapshots, and the snapshots of all the
+    following time steps, are identical can be merged: their distance is a
+    period of the sequence of snapshots, whose smallest period is the least
+    common multiple of the lengths of the primitive patterns. So the
+    compressed time horizon is the smallest possible one.
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    """
+    if tau is None: tau = {e: '1' for e in E}
+    lcm = lambda x,y: abs(x*y) // math.gcd(x,y)
+    compressed_tau = {e: structural.get_primitive_pattern(edge_pattern)
+            for e, edge_pattern in tau.items()}
+    original_horizon = functools.reduce(lcm, map(len, tau.values()), 1)
+    compressed_horizon = functools.reduce(lcm,
+            map(len, compressed_tau.values()), 1)
+    return compressed_tau, original_horizon, compressed_horizon
+
+
+def get_neighbourhoods(V, E, tau=None):
+    """
+    Compute the time horizon of the edge periodic graph (V, E, tau), that is
+    the least common multiple of the lengths of the presence patterns, and
+    the closed neighbourhoods of the vertices at each time step. The vertices
+    are given by their indices in "V": "neighbourhoods[t][i]" is the sorted
+    list of the indices of the vertices adjacent to V[i] at the time step t,
+    including i itself.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    """
+    if tau is None: tau = {e: '1' for e in E}
+
+    # Compute the least common multiple.
+    pattern_lengths = list(map(len, tau.values()))
+    time_horizon = functools.reduce(lambda x,y: abs(x*y) // math.gcd(x,y),
+            pattern_lengths, 1)
+
+    vertex_index = {u: index for index, u in enumerate(V)}
+    neighbourhoods = [[{i} for i in range(len(V))]
+            for _ in range(time_horizon)]
+    for (u, v), edge_pattern in tau.items():
+        i = vertex_index[u]; j = vertex_index[v]
+        for t in range(time_horizon):
+            if edge_pattern[t%len(edge_pattern)] == '1':
+                neighbourhoods[t][i].add(j)
+                neighbourhoods[t][j].add(i)
+    return time_horizon, [list(map(sorted, layer))
+            for layer in neighbourhoods]
+
+
+def get_game_graph(V, E, tau=None, k=1, compact=False, symmetric=False,
+        automorphisms=False, workers=None, directory=None,
+        checkpoint_interval=reachability_game.CHECKPOINT_INTERVAL):
     """
     Compute the game graph where the "k"-cops and robbers game takes place on
     the edge periodic graph (V, E, tau). If "tau" is not specified, then the
     graph is considered to be static.
+    If "compact" is set, the vertices of the game graph are numbered by a
+    "StateEncoder" which is returned in place of the list of vertices, and the
+    arcs are returned as a "reachability_game.CSRArcs" of NumPy arrays.
+    If "symmetric" is set, the cops are interchangeable and only the vertices
+    where the cops are sorted in the order of "V" are kept, the arcs pointing
+    to the sorted successors.
+    If "automorphisms" is set, the game graph is built over the orbits of
+    its vertices under the automorphisms of (V, E, tau), numbered by a
+    "QuotientStateEncoder". This is only available in compact form.
+    If "workers" is given, the compact game graph is built by as many
+    processes (see "_get_parallel_game_graph").
+    If "directory" is given, the arcs of the compact game graph are written
+    to memory-mapped files of this directory and returned as memory-mapped
+    arrays, so they do not have to fit in memory. The files are reused by
+    the next calls on the same game, and the build is checkpointed at most
+    every "checkpoint_interval" seconds, so an interrupted build is resumed
+    by the next call (see "_get_mapped_game_graph").
     :param V: The list of vertices
     :param E: The list of edges
     :param tau: The presence function of the edges in E in dict
     :param k: The number of cops in the game
+    :param compact: A flag to get the integer-encoded game graph
+    :param symmetric: A flag to identify the permutations of the cops
+    :param automorphisms: A flag to get the quotient of the game graph by
+        the automorphisms of the graph
+    :param workers: The number of processes building the compact game
+        graph
+    :param directory: A directory where the compact game graph is kept
+    :param checkpoint_interval: The smallest number of seconds between two
+        checkpoints of the build in "directory"
     """
     logger = logging.getLogger('main.cops_robbers_game')
     logger.info('"cops_robbers_game.get_game_graph" called.')
 
-    if tau is None: tau = {e: '1' for e in E}
+    if workers is not None and (not compact or automorphisms):
+        raise ValueError('Only the compact game graph without the quotient '\
+                'by the automorphisms can be built in parallel.')
+    if directory is not None and (not compact or automorphisms
+            or workers is not None):
+        raise ValueError('Only the compact game graph without the quotient '\
+                'by the automorphisms can be built sequentially in a '\
+                'directory.')
 
-    # Compute an adjacency matrix to simplify the algorithm.
-    vertex_index = {u: index for index, u in enumerate(V)}
-    adjacency = [[tau[(u, v)] if (u, v) in tau else
-                    tau[(v, u)] if (v, u) in tau else
-                    '1' if u == v else
-                    '0' for u in V] for v in V]
-    
-    # Compute the least common multiple.
-    pattern_lengths = list(map(len, tau.values()))
-    time_horizon = functools.reduce(lambda x,y: abs(x*y) // math.gcd(x,y),
-            pattern_lengths)
+    # The moves are enumerated from the neighbourhoods, so the cost is
+    # proportional to the number of arcs.
+    time_horizon, neighbourhoods = get_neighbourhoods(V, E, tau)
+
+    if automorphisms:
+        if not compact:
+            raise ValueError('The quotient of the game graph by the '\
+                    'automorphisms is only available in compact form.')
+        generators = graph_automorphisms.get_automorphisms(V, E, tau)
+        logger.info(f'{len(generators)} generators of automorphisms found.')
+        return _get_quotient_game_graph(V, neighbourhoods, k, time_horizon,
+                symmetric, generators)
+
+    if compact and directory is not None:
+        return _get_mapped_game_graph(V, neighbourhoods, k, time_horizon,
+                symmetric, directory, checkpoint_interval)
+    if compact and workers is not None:
+        return _get_parallel_game_graph(V, neighbourhoods, k, time_horizon,
+                symmetric, workers)
+    if compact:
+        return _get_compact_game_graph(V, neighbourhoods, k, time_horizon,
+                symmetric)
 
     # Compute the set of vertices of the game graph.
     V_gg = []; A_gg = []
+    for u, successors in _iter_game_graph(V, neighbourhoods, k, time_horizon,
+            symmetric):
+        V_gg.append(u)
+        A_gg.extend((u, v) for v in successors)
+
+    return V_gg, A_gg
+
+
+def iter_game_graph(V, E, tau=None, k=1, symmetric=False):
+    """
+    Generate the vertices of the game graph of "get_game_graph" one at a
+    time, in the same order, each with the list of its successors. The game
+    graph is never stored, so it can be consumed as a stream (see
+    "stream_to_reachability_game").
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    :param k: The number of cops in the game
+    :param symmetric: A flag to identify the permutations of the cops
+    """
+    logger = logging.getLogger('main.cops_robbers_game')
+    logger.info('"cops_robbers_game.iter_game_graph" called.')
+
+    time_horizon, neighbourhoods = get_neighbourhoods(V, E, tau)
+    return _iter_game_graph(V, neighbourhoods, k, time_horizon, symmetric)
+
+
+def _iter_game_graph(V, neighbourhoods, k, time_horizon, symmetric=False):
+    """
+    Generate the pairs (u, successors) of the game graph from the
+    neighbourhoods (see "get_neighbourhoods").
+    :param V: The list of vertices
+    :param neighbourhoods: The closed neighbourhoods at each time step
+    :param k: The number of cops in the game
+    :param time_horizon: The number of time steps of the game graph
+    :param symmetric: A flag to identify the permutations of the cops
+    """
+    if symmetric:
+        cop_configurations = list(
+                itertools.combinations_with_replacement(range(len(V)), k))
+    else:
+        cop_configurations = list(itertools.product(range(len(V)), repeat=k))
+
     for t in range(time_horizon):
+        N = neighbourhoods[t]
+        next_t = (t+1)%time_horizon
         for s in [False, True]:
-            for *c, r in itertools.product(V, repeat=k+1):
-                u = (*c, r, s, t)
-                V_gg.append(u)
-                if r in c: continue
-
-                next_s = not s
-                if s: # Robber's move
-                    for next_r in V:
-                        edge_pattern = adjacency[vertex_index[r]] \
-                                [vertex_index[next_r]]
-                        if edge_pattern[t%len(edge_pattern)] == '0' \
-                                or next_r in c:
-                            continue
-                        A_gg.append((u, (*c, next_r, next_s,
-                                (t+1)%time_horizon)))
-                else: # Cops' move
-                    for next_c in itertools.product(V, repeat=k):
-                        valid_flag = True # This can be more effective
-                        for i in range(len(c)):
-                            edge_pattern = adjacency[vertex_index[c[i]]] \
-                                    [vertex_index[next_c[i]]]
-                            if c[i] != next_c[i] and \
-                                    edge_pattern[t%len(edge_pattern)] == '0':
-                                # It is impossible for a cops to move in
-                                # one rounds to a non adjacent vertex.
-                                valid_flag = False
-                                break
-                        if valid_flag:
-                            A_gg.append((u, (*next_c, r, next_s,t)))
+            next_s = not s
+            for c in cop_configurations:
+                cops = tuple(V[i] for i in c)
+                if not s:
+                    # The moves of the cops do not depend on the robber.
+                    next_cops = itertools.product(*(N[i] for i in c))
+                    if symmetric:
+                        next_cops = dict.fromkeys(map(tuple,
+                                map(sorted, next_cops)))
+                    next_cops = [tuple(V[i] for i in next_c)
+                            for next_c in next_cops]
+                for r in range(len(V)):
+                    u = (*cops, V[r], s, t)
+                    if r in c:
+                        yield u, []
+                    elif s: # Robber's move
+                        yield u, [(*cops, V[next_r], next_s, next_t)
+                                for next_r in N[r] if next_r not in c]
+                    else: # Cops' move
+                        yield u, [(*next_c, V[r], next_s, t)
+                                for next_c in next_cops]
 
-    return V_gg, A_gg
+
+def _iter_compact_block(encoder, neighbourhoods, t, s, first, last):
+    """
+    Generate the lists of the integer successors of the vertices
+    (*c, r, s, t) of the game graph numbered by "encoder", for the
+    configurations c of the cops numbered from "first" to "last" - 1, in
+    the order of their numbers.
+    :param encoder: A "StateEncoder"
+    :param neighbourhoods: The closed neighbourhoods at each time step (see
+        "get_neighbourhoods")
+    :param t: A time step
+    :param s: A flag meaning that the robber moves
+    :param first: The number of the first configuration of the cops
+    :param last: The number of the configuration after the last one
+    """
+    n = encoder.n; k = encoder.k; num_positions = encoder.num_positions
+    time_horizon = encoder.time_horizon
+    N = neighbourhoods[t]
+    if not encoder.symmetric:
+        # The neighbourhoods of the cops weighted by their radix in the
+        # mixed-radix numbering.
+        weighted_N = [[[j * n ** (k-i) for j in N[u]] for u in range(n)]
+                for i in range(k)]
+    next_base = (2*((t+1)%time_horizon) if s else 2*t + 1) * num_positions
+    for cop_configuration in range(first, last):
+        c = encoder.cop_configurations[cop_configuration]
+        if s:
+            cops_part = next_base + cop_configuration * n
+        elif encoder.symmetric:
+            next_cops = sorted({n * encoder.cop_configuration_index(next_c)
+                    for next_c in itertools.product(*(N[i] for i in c))})
+        else:
+            # The moves of the cops do not depend on the robber.
+            next_cops = list(map(sum, itertools.product(
+                    *(weighted_N[i][j] for i, j in enumerate(c)))))
+        for r in range(n):
+            if r in c:
+                yield []
+            elif s: # Robber's move
+                yield [cops_part + next_r for next_r in N[r]
+                        if next_r not in c]
+            else: # Cops' move
+                robber_part = next_base + r
+                yield [robber_part + next_c for next_c in next_cops]
+
+
+def _get_compact_game_graph(V, neighbourhoods, k, time_horizon,
+        symmetric=False):
+    """
+    Compute the integer-encoded game graph. The vertices are numbered by a
+    "StateEncoder" and the arcs leaving the vertex "i" are the elements
+    "targets[offsets[i]:offsets[i+1]]" of the returned "CSRArcs".
+    :param V: The list of vertices
+    :param neighbourhoods: The closed neighbourhoods at each time step (see
+        "get_neighbourhoods")
+    :param k: The number of cops in the game
+    :param time_horizon: The number of time steps of the game graph
+    :param symmetric: A flag to identify the permutations of the cops
+    """
+    encoder = StateEncoder(V, k, time_horizon, symmetric)
+    offsets = np.zeros(encoder.num_states + 1, dtype=np.int64)
+    targets = array.array('q')
+
+    index = 0
+    for t in range(time_horizon):
+        for s in [False, True]:
+            for successors in _iter_compact_block(encoder, neighbourhoods, t,
+                    s, 0, len(encoder.cop_configurations)):
+                index += 1
+                targets.extend(successors)
+                offsets[index] = len(targets)
+
+    return encoder, reachability_game.CSRArcs(offsets,
+            np.frombuffer(targets, dtype=np.int64))
+
+
+# The version of the files written by "_get_mapped_game_graph".
+MAPPED_GAME_GRAPH_VERSION = 1
+
+
+def _get_game_graph_key(n, k, time_horizon, symmetric, neighbourhoods):
+    """
+    Compute a digest of the parameters that determine the integer-encoded
+    game graph, so that its files are only reused for the same game.
+    """
+    parameters = json.dumps({'n': n, 'k': k, 'time_horizon': time_horizon,
+            'symmetric': symmetric, 'neighbourhoods': neighbourhoods})
+    return hashlib.sha256(parameters.encode()).hexdigest()
+
+
+def _read_json(path):
+    """
+    Compute the JSon object of the file "path", or None if it cannot be
+    read.
+    """
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, json_object):
+    """
+    Replace the file "path" by the JSon object "json_object" at once, so an
+    interruption leaves either the old or the new file.
+    """
+    with open(path + '.tmp', 'w') as file:
+        json.dump(json_object, file)
+    os.replace(path + '.tmp', path)
+
+
+def _get_mapped_game_graph(V, neighbourhoods, k, time_horizon, symmetric,
+        directory, checkpoint_interval=reachability_game.CHECKPOINT_INTERVAL):
+    """
+    Compute the integer-encoded game graph of "_get_compact_game_graph" in
+    the memory-mapped files 'offsets.npy' and 'targets.npy' of "directory".
+    The targets are streamed to the file by chunks, and its header is
+    rewritten with the number of arcs at the end. The file 'game.json' is
+    written last and identifies the game, so the files of a complete build
+    of the same game are loaded instead of built again.
+    The build is checkpointed by time steps: at most every
+    "checkpoint_interval" seconds, the files are flushed and the number of
+    time steps built is written to the file 'build.json', from which an
+    interrupted build of the same game is resumed.
+    :param V: The list of vertices
+    :param neighbourhoods: The closed neighbourhoods at each time step (see
+        "get_neighbourhoods")
+    :param k: The number of cops in the game
+    :param time_horizon: The number of time steps of the game graph
+    :param symmetric: A flag to identify the permutations of the cops
+    :param directory: The directory of the files, created if it does not
+        exist
+    :param checkpoint_interval: The smallest number of seconds between two
+        checkpoints
+    """
+    logger = logging.getLogger('main.cops_robbers_game')
+    encoder = StateEncoder(V, k, time_horizon, symmetric)
+    key = _get_game_graph_key(len(V), k, time_horizon, symmetric,
+            neighbourhoods)
+    offsets_path = os.path.join(directory, 'offsets.npy')
+    targets_path = os.path.join(directory, 'targets.npy')
+    metadata_path = os.path.join(directory, 'game.json')
+    build_path = os.path.join(directory, 'build.json')
+    if _read_json(metadata_path) == {'version': MAPPED_GAME_GRAPH_VERSION,
+            'key': key}:
+        logger.info(f'Game graph loaded from \'{directory}\'.')
+        return encoder, reachability_game.CSRArcs(
+                np.load(offsets_path, mmap_mode='r'),
+                np.load(targets_path, mmap_mode='r'))
+
+    header = {'descr': np.dtype(np.int64).str, 'fortran_order': False,
+            'shape': (0,)}
+    build = _read_json(build_path)
+    if build is not None and build.get('version') \
+            == MAPPED_GAME_GRAPH_VERSION and build.get('key') == key:
+        logger.info(f'Game graph resumed from the time step '\
+                f'{build["time_step"]}.')
+        first_time_step = build['time_step']
+        num_targets = build['num_targets']
+        offsets = np.lib.format.open_memmap(offsets_path, mode='r+')
+        file = open(targets_path, 'r+b')
+        np.lib.format.read_magic(file)
+        np.lib.format.read_array_header_1_0(file)
+        # The arcs written after the checkpoint are built again.
+        file.seek(file.tell() + 8 * num_targets)
+        file.truncate()
+    else:
+        os.makedirs(directory, exist_ok=True)
+        # The files of another game are replaced.
+        for name in ['game.json', 'build.json', 'previous_offsets.npy',
+                'previous_targets.npy', 'attractor.npz']:
+            if os.path.exists(os.path.join(directory, name)):
+                os.remove(os.path.join(directory, name))
+        first_time_step = 0; num_targets = 0
+        offsets = np.lib.format.open_memmap(offsets_path, mode='w+',
+                dtype=np.int64, shape=(encoder.num_states + 1,))
+        offsets[0] = 0
+        file = open(targets_path, 'w+b')
+        # NumPy pads the header, so it keeps its length when the number of
+        # arcs is written.
+        np.lib.format.write_array_header_1_0(file, header)
+
+    with file:
+        targets = array.array('q')
+        index = 2 * first_time_step * encoder.num_positions
+        last_checkpoint = time.monotonic()
+        for t in range(first_time_step, time_horizon):
+            for s in [False, True]:
+                for successors in _iter_compact_block(encoder,
+                        neighbourhoods, t, s, 0,
+                        len(encoder.cop_configurations)):
+                    index += 1
+                    targets.extend(successors)
+                    offsets[index] = num_targets + len(targets)
+                    if len(targets) >= reachability_game.CHUNK_SIZE:
+                        targets.tofile(file)
+                        num_targets += len(targets)
+                        targets = array.array('q')
+            if t + 1 < time_horizon and time.monotonic() - last_checkpoint \
+                    >= checkpoint_interval:
+                targets.tofile(file)
+                num_targets += len(targets)
+                targets = array.array('q')
+                file.flush(); os.fsync(file.fileno())
+                offsets.flush()
+                _write_json(build_path, {'version': MAPPED_GAME_GRAPH_VERSION,
+                        'key': key, 'time_step': t + 1,
+                        'num_targets': num_targets})
+                last_checkpoint = time.monotonic()
+        targets.tofile(file)
+        num_targets += len(targets)
+        file.seek(0)
+        np.lib.format.write_array_header_1_0(file,
+                dict(header, shape=(num_targets,)))
+    offsets.flush()
+    del offsets
+    _write_json(metadata_path, {'version': MAPPED_GAME_GRAPH_VERSION,
+            'key': key})
+    if os.path.exists(build_path):
+        os.remove(build_path)
+
+    return encoder, reachability_game.CSRArcs(
+            np.load(offsets_path, mmap_mode='r'),
+            np.load(targets_path, mmap_mode='r'))
+
+
+# The state of a worker process of "_get_parallel_game_graph".
+_worker_game = None
+
+
+def _init_worker_game(encoder, neighbourhoods):
+    global _worker_game
+    _worker_game = encoder, neighbourhoods
+
+
+def _get_block_vertices(encoder, t, s, first, last):
+    """
+    Compute the range of the numbers of the vertices of a block of
+    "_iter_compact_block".
+    """
+    base = (2*t + s) * encoder.num_positions
+    return base + first * encoder.n, base + last * encoder.n
+
+
+def _build_block(block):
+    """
+    Write the out-degrees of the vertices of the block (t, s, first, last),
+    then the targets of their arcs, in a new shared memory. Return its name
+    and the number of targets.
+    """
+    encoder, neighbourhoods = _worker_game
+    degrees = array.array('q'); targets = array.array('q')
+    for successors in _iter_compact_block(encoder, neighbourhoods, *block):
+        degrees.append(len(successors))
+        targets.extend(successors)
+    memory = shared_memory.SharedMemory(create=True,
+            size=max(1, 8 * (len(degrees) + len(targets))))
+    values = np.ndarray(len(degrees) + len(targets), dtype=np.int64,
+            buffer=memory.buf)
+    values[:len(degrees)] = np.frombuffer(degrees, dtype=np.int64)
+    values[len(degrees):] = np.frombuffer(targets, dtype=np.int64)
+    del values
+    name = memory.name
+    memory.close()
+    return name, len(targets)
+
+
+def _get_parallel_game_graph(V, neighbourhoods, k, time_horizon, symmetric,
+        workers):
+    """
+    Compute the integer-encoded game graph of "_get_compact_game_graph" on
+    "workers" processes. The vertices are split in blocks of configurations
+    of the cops within a time step and a side. The successors of every
+    block are generated once: the worker writes the out-degrees of the
+    block and the targets of its arcs in a shared memory of its own, which
+    the parent copies at its place, so no arc is sent between the processes.
+    :param V: The list of vertices
+    :param neighbourhoods: The closed neighbourhoods at each time step (see
+        "get_neighbourhoods")
+    :param k: The number of cops in the game
+    :param time_horizon: The number of time steps of the game graph
+    :param symmetric: A flag to identify the permutations of the cops
+    :param workers: The number of worker processes
+    """
+    encoder = StateEncoder(V, k, time_horizon, symmetric)
+    num_configurations = len(encoder.cop_configurations)
+    # A few blocks per worker balance the load.
+    num_blocks = max(1, -(-4 * workers // (2 * time_horizon)))
+    size = -(-num_configurations // num_blocks)
+    blocks = [(t, s, first, min(first + size, num_configurations))
+            for t in range(time_horizon) for s in [False, True]
+            for first in range(0, num_configurations, size)]
+
+    with concurrent.futures.ProcessPoolExecutor(workers,
+            initializer=_init_worker_game,
+            initargs=(encoder, neighbourhoods)) as executor:
+        futures = [executor.submit(_build_block, block) for block in blocks]
+        try:
+            num_targets = sum(future.result()[1] for future in futures)
+            offsets = np.zeros(encoder.num_states + 1, dtype=np.int64)
+            targets = np.empty(num_targets, dtype=np.int64)
+            # The blocks follow each other in the numbering of the vertices,
+            # so their targets do too.
+            offset = 0
+            for block, future in zip(blocks, futures):
+                name, num_block_targets = future.result()
+                start, end = _get_block_vertices(encoder, *block)
+                memory = shared_memory.SharedMemory(name=name)
+                values = np.ndarray(end - start + num_block_targets,
+                        dtype=np.int64, buffer=memory.buf)
+                offsets[start+1:end+1] = values[:end-start]
+                targets[offset:offset+num_block_targets] = \
+                        values[end-start:]
+                offset += num_block_targets
+                del values
+                memory.close()
+            np.cumsum(offsets, out=offsets)
+        finally:
+            # Every shared memory written by a worker is freed, even if
+            # another worker failed.
+            for future in futures:
+                if future.exception() is None:
+                    memory = shared_memory.SharedMemory(
+                            name=future.result()[0])
+                    memory.close()
+                    memory.unlink()
+
+    return encoder, reachability_game.CSRArcs(offsets, targets)
+
+
+def _get_quotient_game_graph(V, neighbourhoods, k, time_horizon, symmetric,
+        generators):
+    """
+    Compute the integer-encoded quotient of the game graph by the group
+    generated by "generators". The vertices are numbered by a
+    "QuotientStateEncoder" and the arcs leave the representatives of the
+    orbits toward the orbits of their successors.
+    :param V: The list of vertices
+    :param neighbourhoods: The closed neighbourhoods at each time step (see
+        "get_neighbourhoods")
+    :param k: The number of cops in the game
+    :param time_horizon: The number of time steps of the game graph
+    :param symmetric: A flag to identify the permutations of the cops
+    :param generators: The permutations generating a group of automorphisms
+    """
+    encoder = QuotientStateEncoder(V, k, time_horizon, symmetric, generators)
+    n = encoder.n; num_positions = encoder.num_positions
+    offsets = np.zeros(encoder.num_states + 1, dtype=np.int64)
+    targets = array.array('q')
+    position_classes = encoder.position_classes.tolist()
+    representatives = encoder.representatives.tolist()
+
+    weights = [n ** (k-i) for i in range(k)]
+    index = 0
+    for t in range(time_horizon):
+        N = neighbourhoods[t]
+        for s in [False, True]:
+            next_base = (2*((t+1)%time_horizon) if s else 2*t + 1) \
+                    * num_positions
+            last_cop_configuration = None
+            for position in representatives:
+                cop_configuration, r = divmod(position, n)
+                c = encoder.cop_configurations[cop_configuration]
+                index += 1
+                if r not in c:
+                    if s: # Robber's move
+                        cops_part = cop_configuration * n
+                        next_positions = {position_classes[cops_part + next_r]
+                                for next_r in N[r] if next_r not in c}
+                    else: # Cops' move
+                        if cop_configuration != last_cop_configuration:
+                            last_cop_configuration = cop_configuration
+                            next_cops = {n * encoder.cop_configuration_index(
+                                    next_c) if symmetric else
+                                    sum(weight * j for weight, j
+                                    in zip(weights, next_c))
+                                    for next_c in itertools.product(
+                                    *(N[i] for i in c))}
+                        next_positions = {position_classes[next_c + r]
+                                for next_c in next_cops}
+                    targets.extend(next_base + next_position
+                            for next_position in sorted(next_positions))
+                offsets[index] = len(targets)
+
+    return encoder, reachability_game.CSRArcs(offsets,
+            np.frombuffer(targets, dtype=np.int64))
+
+
+def get_bitset_winning_sets(V, E, tau=None, k=1, symmetric=False,
+        max_rounds=None):
+    """
+    Compute, for every time step t and configuration c of the cops, the set
+    of the positions r of the robber such that the cops win from the vertex
+    (*c, r, False, t), as an integer whose bit i is set if r = V[i]. The sets
+    of the vertices (*c, r, True, t) are computed alongside. A round of the
+    cops unites the sets of their next configurations, and a round of the
+    robber keeps the positions whose neighbourhood is included in the set of
+    the next time step, so every operation works on all the positions of the
+    robber at once.
+    The rounds stop as soon as a configuration c has every position in its
+    set at the time step 0, or after "max_rounds" rounds. Return the
+    "StateEncoder" numbering the configurations, the sets, and the number of
+    rounds after which a configuration covers every position, which is the
+    capture time (see "get_capture_time"), or None if there is none.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    :param k: The number of cops in the game
+    :param symmetric: A flag to identify the permutations of the cops
+    :param max_rounds: The largest number of rounds
+    """
+    logger = logging.getLogger('main.cops_robbers_game')
+    logger.info('"cops_robbers_game.get_bitset_winning_sets" called.')
+
+    time_horizon, neighbourhoods = get_neighbourhoods(V, E, tau)
+    encoder = StateEncoder(V, k, time_horizon, symmetric)
+    n = encoder.n
+    everything = (1 << n) - 1
+    masks = [[sum(1 << j for j in N[i]) for i in range(n)]
+            for N in neighbourhoods]
+    captured = [sum(1 << i for i in set(c))
+            for c in encoder.cop_configurations]
+    # The next configurations of the cops do not depend on the robber.
+    cop_moves = [[sorted({encoder.cop_configuration_index(next_c)
+            for next_c in itertools.product(*(N[i] for i in c))})
+            for c in encoder.cop_configurations] for N in neighbourhoods]
+
+    winning = [list(captured) for _ in range(time_horizon)]
+    rounds = 0
+    while everything not in winning[0]:
+        if max_rounds is not None and rounds >= max_rounds:
+            return encoder, winning, None
+        # The robber escapes from the positions adjacent to a position where
+        # he wins at the next time step, unless a cop is there.
+        robber_winning = []
+        for t in range(time_horizon):
+            layer = []
+            for c, next_winning in enumerate(
+                    winning[(t+1) % time_horizon]):
+                escaping = everything & ~next_winning
+                losing = 0
+                while escaping:
+                    j = escaping.bit_length() - 1
+                    escaping &= ~(1 << j)
+                    losing |= masks[t][j]
+                layer.append((everything & ~losing) | captured[c])
+            robber_winning.append(layer)
+        next_winning = []
+        for t in range(time_horizon):
+            layer = []
+            for c, moves in enumerate(cop_moves[t]):
+                positions = captured[c]
+                for next_c in moves:
+                    positions |= robber_winning[t][next_c]
+                layer.append(positions)
+            next_winning.append(layer)
+        if next_winning == winning:
+            return encoder, winning, None
+        winning = next_winning
+        rounds += 1
+    return encoder, winning, rounds
+
+
+class ImplicitGameGraph:
+    """
+    The integer-encoded game graph of "get_game_graph" whose arcs are never
+    stored: the successors, the predecessors and the out-degree of a vertex
+    are computed on request from the neighbourhoods of (V, E, tau). The
+    vertices are numbered by the "StateEncoder" "self.encoder". The moves of
+    the cops from a configuration are cached, up to "cache_size"
+    configurations.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    :param k: The number of cops in the game
+    :param symmetric: A flag to identify the permutations of the cops
+    :param cache_size: The number of cached moves of the cops
+    """
+
+    def __init__(self, V, E, tau=None, k=1, symmetric=False,
+            cache_size=4096):
+        self.time_horizon, self.neighbourhoods = get_neighbourhoods(V, E, tau)
+        self.encoder = StateEncoder(V, k, self.time_horizon, symmetric)
+        self.num_vertices = len(self.encoder)
+        self._cop_moves = functools.lru_cache(maxsize=cache_size)(
+                self._compute_cop_moves)
+
+    def _split(self, index):
+        """
+        Compute the time step, the side, the configuration of the cops and
+        the robber of the vertex "index".
+        :param index: An integer between 0 and self.num_vertices - 1
+        """
+        layer, position = divmod(index, self.encoder.num_positions)
+        t, s = divmod(layer, 2)
+        cop_configuration, r = divmod(position, self.encoder.n)
+        return t, s, cop_configuration, r
+
+    def _compute_cop_moves(self, t, cop_configuration):
+        """
+        Compute the sorted list of the configurations the cops can move to at
+        the time step "t". The cops move along the edges, so the cops can go
+        back to "cop_configuration" from each of them.
+        :param t: A time step
+        :param cop_configuration: The number of a configuration of the cops
+        """
+        N = self.neighbourhoods[t]
+        c = self.encoder.cop_configurations[cop_configuration]
+        return sorted({self.encoder.cop_configuration_index(next_c)
+                for next_c in itertools.product(*(N[i] for i in c))})
+
+    def is_player0(self, index):
+        """
+        Compute if the cops move from the vertex "index".
+        :param index: An integer between 0 and self.num_vertices - 1
+        """
+        return (index // self.encoder.num_positions) % 2 == 0
+
+    def targets(self):
+        """
+        Compute the NumPy array of the vertices where the robber is caught.
+        """
+        return np.flatnonzero(np.tile(self.encoder.captured_positions(),
+                2 * self.time_horizon))
+
+    def successors(self, index):
+        """
+        Compute the list of the successors of the vertex "index".
+        :param index: An integer between 0 and self.num_vertices - 1
+        """
+        t, s, cop_configuration, r = self._split(index)
+        c = self.encoder.cop_configurations[cop_configuration]
+        if r in c:
+            return []
+        n = self.encoder.n; num_positions = self.encoder.num_positions
+        if s: # Robber's move
+            base = 2*((t+1)%self.time_horizon) * num_positions \
+                    + cop_configuration * n
+            return [base + next_r for next_r in self.neighbourhoods[t][r]
+                    if next_r not in c]
+        # Cops' move
+        base = (2*t + 1) * num_positions + r
+        return [base + next_c * n
+                for next_c in self._cop_moves(t, cop_configuration)]
+
+    def out_degree(self, index):
+        """
+        Compute the number of successors of the vertex "index".
+        :param index: An integer between 0 and self.num_vertices - 1
+        """
+        t, s, cop_configuration, r = self._split(index)
+        c = self.encoder.cop_configurations[cop_configuration]
+        if r in c:
+            return 0
+        if s:
+            return sum(next_r not in c for next_r in self.neighbourhoods[t][r])
+        return len(self._cop_moves(t, cop_configuration))
+
+    def predecessors(self, index):
+        """
+        Compute the list of the predecessors of the vertex "index".
+        :param index: An integer between 0 and self.num_vertices - 1
+        """
+        t, s, cop_configuration, r = self._split(index)
+        n = self.encoder.n; num_positions = self.encoder.num_positions
+        configurations = self.encoder.cop_configurations
+        if s: # The cops moved at the same time step.
+            base = 2*t * num_positions + r
+            return [base + previous_c * n
+                    for previous_c in self._cop_moves(t, cop_configuration)
+                    if r not in configurations[previous_c]]
+        # The robber moved at the previous time step.
+        c = configurations[cop_configuration]
+        if r in c:
+            return []
+        previous_t = (t-1)%self.time_horizon
+        base = (2*previous_t + 1) * num_positions + cop_configuration * n
+        return [base + previous_r
+                for previous_r in self.neighbourhoods[previous_t][r]
+                if previous_r not in c]
+
+
+# The first bytes of the files of "CompiledGame.save", the version of their
+# format and the alignment of their arrays.
+SOLVED_GAME_MAGIC = b'\x93GGAMES\x00'
+SOLVED_GAME_VERSION = 2
+SOLVED_GAME_ALIGNMENT = 64
+
+
+def _align(offset):
+    return -(-offset // SOLVED_GAME_ALIGNMENT) * SOLVED_GAME_ALIGNMENT
+
+
+def _encode_label(u):
+    """
+    Compute the JSon value of the vertex "u", from which "_decode_label"
+    gives "u" back. JSon has no tuples, so a tuple is written as the object
+    {"tuple": [...]}. Raise a ValueError if "u" is not None, a boolean, an
+    integer, a float, a string or a tuple of them.
+    :param u: A vertex
+    """
+    if u is None or isinstance(u, (bool, int, float, str)):
+        return u
+    if isinstance(u, tuple):
+        return {'tuple': [_encode_label(x) for x in u]}
+    raise ValueError(f'The vertex {u!r} cannot be saved: the vertices must '\
+            'be None, booleans, integers, floats, strings or tuples of them.')
+
+
+def _decode_label(value):
+    if isinstance(value, dict):
+        return tuple(_decode_label(x) for x in value['tuple'])
+    return value
+
+
+class CompiledGame:
+    """
+    The solved integer-encoded game graph of the "k"-cops and robber game on
+    the edge periodic graph (V, E, tau): its "StateEncoder", its arcs as a
+    "reachability_game.CSRArcs", the ranks and the membership array of its
+    attractor, the configurations of the cops from which they win wherever
+    the robber starts and the capture time (see "get_capture_time"), with
+    the normalized presence function and the fingerprint of the instance
+    (see "cache.normalize_graph" and "cache.get_fingerprint"). The
+    vertices of the queries are tuples (*c, r, s, t) as in "get_game_graph",
+    and a query only reads the arcs of its vertex.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    :param k: The number of cops in the game
+    :param symmetric: A flag to identify the permutations of the cops
+    """
+
+    def __init__(self, V, E, tau=None, k=1, symmetric=False):
+        # The presence function is kept to update the game (see "update").
+        self.tau = result_cache.normalize_graph(V, E, tau)
+        # The fingerprint of the instance tells which graph a saved game
+        # was solved on (see "save").
+        self.fingerprint = result_cache.get_fingerprint(V, E, tau, k)
+        self.encoder, self.arcs = get_game_graph(V, E, tau, k, compact=True,
+                symmetric=symmetric)
+        # The reversed arcs are computed by the first update.
+        self.previous = None
+        self._set_ranks(reachability_game.get_attractor_ranks(
+                *game_graph_to_reachability_game(self.encoder, self.arcs)))
+
+    def _set_ranks(self, ranks):
+        self.ranks = ranks
+        self.in_attractor = self.ranks >= 0
+        self.capture_time = get_capture_time(self.encoder, self.ranks)
+        self.winning_cop_configurations = np.flatnonzero(
+                _get_starting_layer(self.encoder, self.in_attractor)
+                .all(axis=1))
+        self.kcop_win = self.winning_cop_configurations.size > 0
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes of the arrays of the compiled game.
+        """
+        return self.arcs.offsets.nbytes + self.arcs.targets.nbytes \
+                + self.ranks.nbytes + self.in_attractor.nbytes \
+                + self.winning_cop_configurations.nbytes
+
+    def winning_starts(self):
+        """
+        Compute the list of the configurations of the cops, as tuples of
+        vertices, from which they win wherever the robber starts.
+        """
+        return [tuple(self.encoder.V[i] for i in
+                self.encoder.cop_configurations[cop_configuration])
+                for cop_configuration in self.winning_cop_configurations]
+
+    def is_winning(self, vertex):
+        """
+        Compute if the cops win from the vertex (*c, r, s, t).
+        :param vertex: A vertex of the game graph as a tuple
+        """
+        return bool(self.in_attractor[self.encoder.encode(vertex)])
+
+    def get_next_winning_moves(self, vertex):
+        """
+        Compute the list of the next moves from the vertex (*c, r, s, t) that
+        lead to a winning game for the player whose turn it is, as
+        "reachability_game.get_next_winning_moves": the moves into the
+        attractor for the cops, and out of it for the robber.
+        :param vertex: A vertex of the game graph as a tuple
+        """
+        index = self.encoder.encode(vertex)
+        successors = self.arcs.targets[self.arcs.offsets[index]:
+                self.arcs.offsets[index+1]]
+        # The cops move on the vertices where s is False.
+        winning = self.in_attractor[successors] != bool(vertex[-2])
+        return [self.encoder.decode(v) for v in successors[winning]]
+
+    def get_fastest_moves(self, vertex):
+        """
+        Compute the list of the next moves from the vertex (*c, r, s, t) that
+        capture the robber the fastest if the cops play, and that delay the
+        capture the most if the robber plays, when the cops win from this
+        vertex. Otherwise, these are the winning moves.
+        :param vertex: A vertex of the game graph as a tuple
+        """
+        index = self.encoder.encode(vertex)
+        if self.ranks[index] < 0:
+            return self.get_next_winning_moves(vertex)
+        successors = self.arcs.targets[self.arcs.offsets[index]:
+                self.arcs.offsets[index+1]]
+        fastest = self.ranks[successors] == self.ranks[index] - 1
+        return [self.encoder.decode(v) for v in successors[fastest]]
+
+    def update(self, edge, edge_pattern=None):
+        """
+        Compute the compiled game where the presence pattern of the edge
+        "edge" is "edge_pattern", or where the edge is removed if
+        "edge_pattern" is None. Return the pair (game, number of vertices
+        touched); this game is not modified.
+        Only the time steps where the edge changes are rebuilt: the arcs of
+        the cops from the configurations on its ends and the arcs of the
+        robber from its ends are replaced (see
+        "reachability_game.replace_arcs"), and the ranks are repaired
+        around them (see "reachability_game.update_attractor_ranks"). If
+        the length of the pattern does not divide the time horizon, the
+        game is compiled again.
+        :param edge: A pair of vertices
+        :param edge_pattern: The new presence pattern of the edge
+        """
+        encoder = self.encoder
+        u, v = edge
+        i = encoder.vertex_index[u]; j = encoder.vertex_index[v]
+        # The edges of "normalize_graph" go from the smaller index.
+        edge = encoder.V[min(i, j)], encoder.V[max(i, j)]
+        tau = dict(self.tau)
+        if i == j or edge_pattern is None or '1' not in edge_pattern:
+            tau.pop(edge, None)
+        else:
+            tau[edge] = structural.get_primitive_pattern(edge_pattern)
+        if i == j or tau.get(edge) == self.tau.get(edge):
+            return self, 0
+        if encoder.time_horizon % len(tau.get(edge, '0')) != 0:
+            game = CompiledGame(encoder.V, list(tau), tau, encoder.k,
+                    encoder.symmetric)
+            return game, game.encoder.num_states
+
+        def is_present(edge_tau, t):
+            edge_pattern = edge_tau.get(edge, '0')
+            return edge_pattern[t % len(edge_pattern)] == '1'
+        time_steps = [t for t in range(encoder.time_horizon)
+                if is_present(self.tau, t) != is_present(tau, t)]
+        time_horizon, neighbourhoods = get_neighbourhoods(encoder.V,
+                list(tau), tau)
+        neighbourhoods = [neighbourhoods[t % time_horizon]
+                for t in range(encoder.time_horizon)]
+
+        replaced = dict()
+        for t in time_steps:
+            for cop_configuration, c in enumerate(
+                    encoder.cop_configurations):
+                # The cops move from the layer 2t, and the robber from the
+                # layer 2t + 1.
+                for s in [False, True]:
+                    if not s and i not in c and j not in c:
+                        continue
+                    base = (2*t + s) * encoder.num_positions \
+                            + cop_configuration * encoder.n
+                    for r, successors in enumerate(_iter_compact_block(
+                            encoder, neighbourhoods, t, s,
+                            cop_configuration, cop_configuration + 1)):
+                        if not s or r in (i, j):
+                            replaced[base + r] = np.array(successors,
+                                    dtype=np.int64)
+        replaced = {vertex: successors for vertex, successors
+                in replaced.items() if not np.array_equal(successors,
+                self.arcs.targets[self.arcs.offsets[vertex]:
+                self.arcs.offsets[vertex+1]])}
+
+        # The lists of the predecessors of the ends of the replaced arcs are
+        # replaced too.
+        previous = self.previous
+        if previous is None:
+            previous = reachability_game.get_predecessors(self.arcs)
+        removed = collections.defaultdict(set)
+        added = collections.defaultdict(set)
+        for vertex, successors in replaced.items():
+            old_successors = set(self.arcs.targets[self.arcs.offsets[vertex]:
+                    self.arcs.offsets[vertex+1]].tolist())
+            for successor in old_successors.difference(successors.tolist()):
+                removed[successor].add(vertex)
+            for successor in set(successors.tolist()) \
+                    .difference(old_successors):
+                added[successor].add(vertex)
+        replaced_previous = dict()
+        for successor in set(removed).union(added):
+            predecessors = set(previous.targets[previous.offsets[successor]:
+                    previous.offsets[successor+1]].tolist())
+            replaced_previous[successor] = np.array(sorted(predecessors
+                    .difference(removed[successor])
+                    .union(added[successor])), dtype=np.int64)
+
+        game = CompiledGame.__new__(CompiledGame)
+        game.tau = tau
+        game.fingerprint = result_cache.get_fingerprint(encoder.V, list(tau),
+                tau, encoder.k)
+        game.encoder = encoder
+        game.arcs = reachability_game.replace_arcs(self.arcs, replaced)
+        game.previous = reachability_game.replace_arcs(previous,
+                replaced_previous)
+        S0, _, _, _ = game_graph_to_reachability_game(encoder, game.arcs)
+        ranks, num_touched = reachability_game.update_attractor_ranks(S0,
+                game.arcs, self.ranks, list(replaced), game.previous)
+        game._set_ranks(ranks)
+        return game, num_touched
+
+    def save(self, path):
+        """
+        Write the compiled game to the file "path" (see "load_game"). The
+        file starts with a magic string, the version of the format and a
+        JSon header holding the fingerprint of the instance, its presence
+        function, the parameters of the "StateEncoder", the capture time and
+        the places of the arrays, which follow as raw arrays aligned on
+        "SOLVED_GAME_ALIGNMENT" bytes. The edges of the presence function are
+        written as pairs of indices in V, and the tuples in V are marked, so
+        that the vertices are loaded back as they were. The file is replaced
+        at once, so a reader never sees a partial file. Raise a ValueError if
+        a vertex is not None, a boolean, an integer, a float, a string or a
+        tuple of them.
+        :param path: The path to the file
+        """
+        vertex_index = self.encoder.vertex_index
+        arrays = {'offsets': self.arcs.offsets, 'targets': self.arcs.targets,
+                'ranks': self.ranks, 'in_attractor': self.in_attractor,
+                'winning_cop_configurations':
+                self.winning_cop_configurations}
+        header = {'fingerprint': self.fingerprint,
+                'V': [_encode_label(u) for u in self.encoder.V],
+                'tau': [[vertex_index[u], vertex_index[v], edge_pattern]
+                for (u, v), edge_pattern in self.tau.items()],
+                'k': self.encoder.k,
+                'time_horizon': self.encoder.time_horizon,
+                'symmetric': self.encoder.symmetric,
+                'capture_time': None if self.capture_time is None
+                else int(self.capture_time), 'arrays': dict()}
+        # The places of the arrays depend on the length of the header, which
+        # depends on the places, so the header grows until they fit.
+        header_size = 0
+        while True:
+            offset = _align(len(SOLVED_GAME_MAGIC) + 8 + header_size)
+            for name, values in arrays.items():
+                header['arrays'][name] = [values.dtype.str, len(values),
+                        offset]
+                offset = _align(offset + values.nbytes)
+            encoded_header = json.dumps(header).encode()
+            if len(encoded_header) <= header_size:
+                break
+            header_size = len(encoded_header)
+        encoded_header = encoded_header.ljust(header_size)
+
+        with open(path + '.tmp', 'wb') as file:
+            file.write(SOLVED_GAME_MAGIC)
+            file.write(struct.pack('<II', SOLVED_GAME_VERSION, header_size))
+            file.write(encoded_header)
+            for name, values in arrays.items():
+                file.seek(header['arrays'][name][2])
+                np.ascontiguousarray(values).tofile(file)
+            file.truncate(offset)
+        os.replace(path + '.tmp', path)
+
+
+def load_game(path, fingerprint=None):
+    """
+    Compute the "CompiledGame" saved in the file "path" by
+    "CompiledGame.save". Only the header is read: the arrays are
+    memory-mapped, so they are paged in by the queries. Raise a ValueError
+    if the file is not a saved game, if its version is not supported, or if
+    "fingerprint" is given and differs from the fingerprint of the saved
+    instance.
+    :param path: The path to the file
+    :param fingerprint: The fingerprint of the expected instance (see
+        "cache.get_fingerprint")
+    """
+    logger = logging.getLogger('main.cops_robbers_game')
+    logger.info('"cops_robbers_game.load_game" called.')
+
+    with open(path, 'rb') as file:
+        magic = file.read(len(SOLVED_GAME_MAGIC))
+        if magic != SOLVED_GAME_MAGIC:
+            raise ValueError(f'\'{path}\' is not a saved game.')
+        version, header_size = struct.unpack('<II', file.read(8))
+        if version != SOLVED_GAME_VERSION:
+            raise ValueError(f'The version {version} of the saved game '\
+                    f'\'{path}\' is not supported.')
+        header = json.loads(file.read(header_size))
+    if fingerprint is not None and fingerprint != header['fingerprint']:
+        raise ValueError(f'The saved game \'{path}\' was solved on another '\
+                'instance.')
+
+    arrays = {name: np.memmap(path, dtype=dtype, mode='r', offset=offset,
+            shape=(length,)) if length > 0 else np.zeros(0, dtype=dtype)
+            for name, (dtype, length, offset) in header['arrays'].items()}
+    game = CompiledGame.__new__(CompiledGame)
+    game.fingerprint = header['fingerprint']
+    V = [_decode_label(value) for value in header['V']]
+    game.tau = {(V[i], V[j]): edge_pattern
+            for i, j, edge_pattern in header['tau']}
+    game.previous = None
+    game.encoder = StateEncoder(V, header['k'],
+            header['time_horizon'], header['symmetric'])
+    game.arcs = reachability_game.CSRArcs(arrays['offsets'],
+            arrays['targets'])
+    game.ranks = arrays['ranks']
+    game.in_attractor = arrays['in_attractor']
+    game.capture_time = header['capture_time']
+    game.winning_cop_configurations = arrays['winning_cop_configurations']
+    game.kcop_win = game.winning_cop_configurations.size > 0
+    return game
+
+
+CompiledGameCacheInfo = collections.namedtuple('CompiledGameCacheInfo',
+        ['hits', 'misses', 'evictions', 'num_games', 'nbytes', 'max_bytes'])
+
+
+class _CompiledGameCache:
+    """
+    A least recently used cache of "CompiledGame" bounded by the number of
+    bytes of their arrays. A game larger than the bound is not kept.
+    :param max_bytes: The largest number of bytes of the cached games
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.games = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits = 0; self.misses = 0; self.evictions = 0
+
+    def get(self, key, compile_game):
+        if key in self.games:
+            self.hits += 1
+            self.games.move_to_end(key)
+            return self.games[key]
+        self.misses += 1
+        game = compile_game()
+        if game.nbytes <= self.max_bytes:
+            self.games[key] = game
+            self.nbytes += game.nbytes
+            self.evict()
+        return game
+
+    def evict(self):
+        while self.nbytes > self.max_bytes:
+            _, game = self.games.popitem(last=False)
+            self.nbytes -= game.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self.games.clear()
+        self.nbytes = 0
+
+
+# The default largest number of bytes of the cached compiled games.
+MAX_COMPILED_GAMES_BYTES = 256 * 2**20
+_compiled_games = _CompiledGameCache(MAX_COMPILED_GAMES_BYTES)
+
+
+def compile_game(V, E, tau=None, k=1, symmetric=False):
+    """
+    Compute the "CompiledGame" of the "k"-cops and robber game on the edge
+    periodic graph (V, E, tau), or take it from the in-process cache of the
+    compiled games. The games are identified by V, the normalized presence
+    function (see "cache.normalize_graph"), "k" and "symmetric", and the
+    least recently used ones are evicted when their arrays take more than
+    the bound of "set_compiled_game_cache_limit".
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    :param k: The number of cops in the game
+    :param symmetric: A flag to identify the permutations of the cops
+    """
+    key = (tuple(V), frozenset(result_cache.normalize_graph(V, E, tau)
+            .items()), k, symmetric)
+    return _compiled_games.get(key,
+            lambda: CompiledGame(V, E, tau, k, symmetric))
+
+
+def get_compiled_game_cache_info():
+    """
+    Compute the statistics of the cache of the compiled games as a
+    "CompiledGameCacheInfo": the numbers of hits, misses and evictions, the
+    number of games and of bytes cached, and the bound on the bytes.
+    """
+    return CompiledGameCacheInfo(_compiled_games.hits, _compiled_games.misses,
+            _compiled_games.evictions, len(_compiled_games.games),
+            _compiled_games.nbytes, _compiled_games.max_bytes)
+
+
+def set_compiled_game_cache_limit(max_bytes):
+    """
+    Set the largest number of bytes of the cached compiled games, and evict
+    the least recently used games beyond it.
+    :param max_bytes: A number of bytes
+    """
+    _compiled_games.max_bytes = max_bytes
+    _compiled_games.evict()
+
+
+def clear_compiled_game_cache():
+    """
+    Remove all the compiled games from the cache. The statistics are kept.
+    """
+    _compiled_games.clear()
 
 
 def game_graph_to_reachability_game(V_gg, A_gg):
     """
     Compute and return a reachable game corresponding to the game graph
-    G = (V_gg, A_gg).
+    G = (V_gg, A_gg). If the game graph is integer-encoded (see
+    "get_game_graph"), S0, S1 and F are returned as NumPy arrays of integers
+    and the arcs are returned as they are.
     :param V_gg: A list of vertices of a game graph
     :param A_gg: A list of edges of a game graph
     """
     logger = logging.getLogger('main.com_robber_game')
     logger.info('"cops_robbers_game.game_graph_to_reachability_game" called.')
 
+    if isinstance(V_gg, StateEncoder):
+        num_positions = V_gg.num_positions
+        num_layers = 2 * V_gg.time_horizon
+        states = np.arange(V_gg.num_states, dtype=np.int64) \
+                .reshape(num_layers, num_positions)
+        S0 = states[0::2].ravel(); S1 = states[1::2].ravel()
+        F = np.flatnonzero(np.tile(V_gg.captured_positions(), num_layers))
+        return S0, S1, A_gg, F
+
     S0 = []; S1 = []
-    A = copy.deepcopy(A_gg)
+    # The arcs are immutable tuples, so copying the list is enough.
+    A = list(A_gg)
     F = []
     for v in V_gg:
         *c, r, s, t = v
@@ -99,21 +1443,327 @@ def game_graph_to_reachability_game(V_gg, A_gg):
     return S0, S1, A, F
 
 
-def is_kcop_win(V, E, tau=None, k=1):
+def stream_to_reachability_game(stream):
+    """
+    Compute the reachable game corresponding to the game graph generated by
+    "stream", in one pass. The arcs are not kept: they are counted in the
+    out-degrees and stored reversed in a "reachability_game.PredecessorIndex"
+    which is returned in place of the list of arcs.
+    :param stream: An iterable of pairs (u, successors) (see
+        "iter_game_graph")
+    """
+    logger = logging.getLogger('main.cops_robbers_game')
+    logger.info('"cops_robbers_game.stream_to_reachability_game" called.')
+
+    S0 = []; S1 = []; F = []
+    previous = dict(); num_out_degree = dict()
+    for u, successors in stream:
+        *c, r, s, t = u
+        if r in c:
+            F.append(u)
+        if s:
+            S1.append(u)
+        else:
+            S0.append(u)
+        num_out_degree[u] = len(successors)
+        for v in successors:
+            if v in previous:
+                previous[v].append(u)
+            else:
+                previous[v] = [u]
+    return S0, S1, reachability_game.PredecessorIndex(previous,
+            num_out_degree), F
+
+
+def _get_starting_layer(encoder, values):
+    """
+    Compute the values of the starting vertices (*c, r, False, 0), which are
+    the first layer of the integer-encoded game graph, as an array with a
+    row per configuration c of the cops and a column per vertex r of the
+    robber.
+    :param encoder: The "StateEncoder" of the integer-encoded game graph
+    :param values: A NumPy array indexed by the vertices of the game graph
+    """
+    return encoder.expand_positions(
+            values[:encoder.num_positions]).reshape(-1, encoder.n)
+
+
+def _has_winning_start(encoder, in_attractor):
+    """
+    Compute if there is a configuration of the cops from which they win
+    wherever the robber starts, that is (*c, r, False, 0) is in the
+    attractor for every r.
+    :param encoder: The "StateEncoder" of the integer-encoded game graph
+    :param in_attractor: The boolean membership array of the attractor
+    """
+    return bool(_get_starting_layer(encoder, in_attractor).all(axis=1).any())
+
+
+def get_capture_time(encoder, ranks):
+    """
+    Compute the number of moves of the cops needed to capture the robber
+    from the best configuration of the cops, wherever the robber starts and
+    however he plays, or None if the cops do not win. The rank of a vertex
+    (*c, r, False, 0) counts the moves of both players, the cops moving
+    first, so the cops move (rank + 1) // 2 times.
+    :param encoder: The "StateEncoder" of the integer-encoded game graph
+    :param ranks: The ranks of the vertices (see
+        "reachability_game.get_attractor_ranks"), -1 out of the attractor
+    """
+    starting_layer = _get_starting_layer(encoder, ranks)
+    winning = starting_layer.min(axis=1) >= 0
+    if not winning.any():
+        return None
+    return int(starting_layer[winning].max(axis=1).min() + 1) // 2
+
+
+def prune_unreachable(encoder, S0, S1, A, F):
+    """
+    Compute the sub-game of an integer-encoded reachability game induced by
+    the vertices reachable from the starting vertices (*c, r, False, 0).
+    The attractor of the sub-game is the attractor of the game on these
+    vertices, since they contain their successors. Return the sub-game, the
+    array of its vertices in the game, and the number of pruned vertices.
+    :param encoder: The "StateEncoder" of the game graph
+    :param S0: A NumPy array of integers
+    :param S1: A NumPy array of integers
+    :param A: A "reachability_game.CSRArcs"
+    :param F: A NumPy array of integers
+    """
+    logger = logging.getLogger('main.cops_robbers_game')
+    logger.info('"cops_robbers_game.prune_unreachable" called.')
+
+    # The starting vertices are the first layer (see "_get_starting_layer").
+    reachable = reachability_game.get_reachable(A,
+            np.arange(encoder.num_positions, dtype=np.int64))
+    subgame, vertices = reachability_game.get_subgame(S0, S1, A, F,
+            reachable)
+    num_pruned = encoder.num_states - vertices.size
+    logger.info(f'{num_pruned} of {encoder.num_states} vertices pruned.')
+    return subgame, vertices, num_pruned
+
+
+def is_kcop_win(V, E, tau=None, k=1, compact=False, engine='worklist',
+        symmetric=False, automorphisms=False, force_reduction=False,
+        prune=False, compress=False, cache=None, compiled=False,
+        capture_time=False, max_rounds=None, workers=None, directory=None,
+        checkpoint_interval=reachability_game.CHECKPOINT_INTERVAL):
     """
     Compute if the time-varying graph ("V", "E", "tau") is "k"-cop win.
+    The attractor is computed by the "engine":
+    - 'worklist': "reachability_game.get_attractor";
+    - 'vectorized': "reachability_game.get_vectorized_attractor" on the
+      integer-encoded game graph;
+    - 'implicit': "reachability_game.get_implicit_attractor" on an
+      "ImplicitGameGraph", without storing the arcs;
+    - 'stream': "reachability_game.get_attractor" on the reversed arcs
+      gathered from "iter_game_graph" by "stream_to_reachability_game";
+    - 'bitset': "get_bitset_winning_sets", on the sets of positions of the
+      robber as integers;
+    - 'parallel': "reachability_game.get_parallel_attractor" on the
+      integer-encoded game graph, on "workers" processes.
+    Before the reduction, the cheap rules of "structural.decide" are tried
+    unless "force_reduction" is set.
     :param V: A set of vertices
     :param E: A set of edges
     :param tau: A map from E to a set of bit sequences
     :param k: The number of cops that play on the time-varying graph
+    :param compact: A flag to solve the game on the integer-encoded game graph
+    :param engine: The name of the algorithm computing the attractor
+    :param symmetric: A flag to solve the game where the permutations of the
+        cops are identified
+    :param automorphisms: A flag to solve the game on the quotient of the
+        integer-encoded game graph by the automorphisms of the graph
+    :param force_reduction: A flag to always reduce the problem to a
+        reachability game
+    :param prune: A flag to solve the integer-encoded game only on the
+        vertices reachable from the starting vertices (see
+        "prune_unreachable")
+    :param compress: A flag to replace the presence patterns by their
+        primitive patterns (see "compress_time_horizon")
+    :param cache: A "cache.ResultCache" where the result is looked for
+        before solving the game, and stored after
+    :param compiled: A flag to solve the game with "compile_game", so that
+        the solved game is kept for the next calls and queries
+    :param capture_time: A flag to return the pair (result, capture time)
+        where the capture time is the number of moves of the cops needed to
+        capture the robber from the best starting configuration against the
+        best play of the robber, or None if the cops do not win (see
+        "get_capture_time"). The game is then solved by
+        "reachability_game.iter_attractor_levels" on the integer-encoded
+        game graph, until a starting configuration of the cops is covered.
+    :param max_rounds: The largest number of moves of the cops: the cops
+        win if they capture the robber within "max_rounds" moves. The
+        attractor stops growing after the corresponding levels, or earlier
+        when a starting configuration of the cops is covered.
+    :param workers: The number of processes building the integer-encoded
+        game graph (see "get_game_graph"), which is then solved, and
+        computing the attractor with the engine 'parallel'
+    :param directory: A directory where the integer-encoded game graph and
+        its reversed arcs are kept in memory-mapped files, which are then
+        solved (see "get_game_graph" and "reachability_game.get_predecessors").
+        The build, and the attractor of the engine 'worklist' without
+        pruning, are checkpointed in this directory and resumed from it.
+    :param checkpoint_interval: The smallest number of seconds between two
+        checkpoints in "directory"
     """
     logger = logging.getLogger('main.com_robber_game')
     logger.info('"cops_robbers_game.is_kcop_win" called.')
 
-    attractor = reachability_game.get_attractor(
-            *game_graph_to_reachability_game(
-            *get_game_graph(V, E, tau, k)))
+    if cache is not None and not capture_time and max_rounds is None:
+        fingerprint = result_cache.get_fingerprint(V, E, tau, k)
+        result = cache.get(fingerprint)
+        if result is not None:
+            logger.info('Cache hit.')
+            return result
+        logger.info('Cache miss.')
+        result = is_kcop_win(V, E, tau, k, compact=compact, engine=engine,
+                symmetric=symmetric, automorphisms=automorphisms,
+                force_reduction=force_reduction, prune=prune,
+                compress=compress, compiled=compiled, workers=workers,
+                directory=directory, checkpoint_interval=checkpoint_interval)
+        cache.put(fingerprint, result)
+        return result
+
+    if compiled:
+        game = compile_game(V, E, tau, k, symmetric)
+        result = game.kcop_win if max_rounds is None else \
+                game.kcop_win and game.capture_time <= max_rounds
+        if capture_time:
+            return result, game.capture_time if result else None
+        return result
+
+    if compress and tau is not None:
+        tau, original_horizon, compressed_horizon = \
+                compress_time_horizon(E, tau)
+        logger.info(f'Time horizon compressed from {original_horizon} to '\
+                f'{compressed_horizon}.')
+
+    if engine not in ('worklist', 'vectorized', 'implicit', 'stream',
+            'bitset', 'parallel'):
+        raise ValueError(f'Unknown engine \'{engine}\'.')
+    if engine in ('implicit', 'stream', 'bitset') and automorphisms:
+        raise ValueError(f'The engine \'{engine}\' cannot solve the '\
+                'quotient by the automorphisms.')
+    if engine in ('implicit', 'stream', 'bitset') and prune:
+        raise ValueError(f'The engine \'{engine}\' cannot prune the game.')
+    if engine in ('implicit', 'stream', 'bitset') and workers is not None:
+        raise ValueError(f'The engine \'{engine}\' does not build the '\
+                'game graph in parallel.')
+    if engine in ('implicit', 'stream', 'bitset') and directory is not None:
+        raise ValueError(f'The engine \'{engine}\' does not build the '\
+                'game graph in a directory.')
+    if engine in ('implicit', 'stream') and (capture_time
+            or max_rounds is not None):
+        raise ValueError(f'The engine \'{engine}\' cannot compute the '\
+                'capture time.')
+
+    if engine == 'bitset' and (capture_time or max_rounds is not None
+            or force_reduction):
+        # The rounds of the bitsets are the moves of the cops.
+        _, _, rounds = get_bitset_winning_sets(V, E, tau, k, symmetric,
+                max_rounds)
+        if capture_time:
+            return rounds is not None, rounds
+        return rounds is not None
+
+    if capture_time or max_rounds is not None:
+        # The structural rules do not tell the capture time.
+        encoder, A_gg = get_game_graph(V, E, tau, k, compact=True,
+                symmetric=symmetric, automorphisms=automorphisms,
+                workers=workers, directory=directory,
+                checkpoint_interval=checkpoint_interval)
+        S0, S1, A, F = game_graph_to_reachability_game(encoder, A_gg)
+        vertices = np.arange(encoder.num_states, dtype=np.int64)
+        previous = None
+        if prune:
+            (S0, S1, A, F), vertices, _ = prune_unreachable(encoder, S0, S1,
+                    A, F)
+        elif directory is not None:
+            previous = reachability_game.get_predecessors(A, directory)
+        # The cops capture within T rounds from the vertices of rank at most
+        # 2T, and the first level that covers a starting configuration
+        # gives the capture time. The levels are sorted, so the starting
+        # layer comes first.
+        max_level = None if max_rounds is None else 2 * max_rounds
+        in_attractor = np.zeros(encoder.num_states, dtype=bool)
+        capture_rounds = None
+        for level, frontier in enumerate(
+                reachability_game.iter_attractor_levels(S0, A, F,
+                previous)):
+            if max_level is not None and level > max_level:
+                break
+            frontier = vertices[frontier]
+            in_attractor[frontier] = True
+            if frontier[0] < encoder.num_positions \
+                    and _has_winning_start(encoder, in_attractor):
+                logger.info(f'A starting configuration is covered at the '\
+                        f'level {level}.')
+                capture_rounds = (level + 1) // 2
+                break
+        if capture_time:
+            return capture_rounds is not None, capture_rounds
+        return capture_rounds is not None
+
+    if not force_reduction:
+        decision = structural.decide(V, E, tau, k,
+                lambda V_, E_, k_: is_kcop_win(V_, E_, k=k_, compact=compact,
+                engine=engine, symmetric=symmetric,
+                automorphisms=automorphisms, prune=prune))
+        if decision is not None:
+            result, rule = decision
+            logger.info(f'Structural rule \'{rule}\' decided the instance.')
+            return result
 
+    if engine == 'bitset':
+        _, _, rounds = get_bitset_winning_sets(V, E, tau, k, symmetric)
+        return rounds is not None
+
+    if engine == 'implicit':
+        game = ImplicitGameGraph(V, E, tau, k, symmetric)
+        return _has_winning_start(game.encoder,
+                reachability_game.get_implicit_attractor(game))
+
+    if engine != 'stream' and (compact
+            or engine in ('vectorized', 'parallel') or automorphisms
+            or prune or workers is not None or directory is not None):
+        encoder, A_gg = get_game_graph(V, E, tau, k, compact=True,
+                symmetric=symmetric, automorphisms=automorphisms,
+                workers=workers, directory=directory,
+                checkpoint_interval=checkpoint_interval)
+        game = game_graph_to_reachability_game(encoder, A_gg)
+        vertices = np.arange(encoder.num_states, dtype=np.int64)
+        previous = None
+        if prune:
+            game, vertices, _ = prune_unreachable(encoder, *game)
+        elif directory is not None and engine != 'parallel':
+            previous = reachability_game.get_predecessors(game[2], directory)
+        in_attractor = np.zeros(encoder.num_states, dtype=bool)
+        if engine == 'vectorized':
+            in_attractor[vertices] = \
+                    reachability_game.get_vectorized_attractor(*game,
+                    previous)
+        elif engine == 'parallel':
+            in_attractor[vertices[reachability_game.get_parallel_attractor(
+                    *game, workers=workers)]] = True
+        else:
+            in_attractor[vertices[reachability_game.get_attractor(*game,
+                    previous, None if prune else directory,
+                    checkpoint_interval)]] = True
+        return _has_winning_start(encoder, in_attractor)
+
+    if engine == 'stream':
+        attractor = reachability_game.get_attractor(
+                *stream_to_reachability_game(
+                iter_game_graph(V, E, tau, k, symmetric)))
+    else:
+        attractor = reachability_game.get_attractor(
+                *game_graph_to_reachability_game(
+                *get_game_graph(V, E, tau, k, symmetric=symmetric)))
+
+    # The cops are sorted in the vertices of the symmetric game graph, so the
+    # starting classes are indexed by the configurations of the cops either
+    # way.
     n = len(V)
     starting_classes = dict()
     for *c, r, s, t in attractor:
@@ -126,3 +1776,74 @@ def is_kcop_win(V, E, tau=None, k=1):
         if len(cls) == n:
             return True
     return False
+
+
+def cop_number(V, E, tau=None, max_k=None):
+    """
+    Compute the cop number of the time-varying graph ("V", "E", "tau"), that
+    is the smallest k such that it is k-cop win, or None if it is larger than
+    "max_k". The presence patterns are compressed and the neighbourhoods are
+    computed once, then the values of k are tried in increasing order,
+    between two bounds:
+    - the number of connected components of the graph of the edges present
+      at some time step, since the robber chooses a component without cop;
+    - the size of a dominating set of the first snapshot, since the cops
+      placed on it capture the robber at their first move.
+    A static disconnected graph has for cop number the sum of the cop
+    numbers of its components.
+    :param V: A set of vertices
+    :param E: A set of edges
+    :param tau: A map from E to a set of bit sequences
+    :param max_k: The largest number of cops tried
+    """
+    logger = logging.getLogger('main.cops_robbers_game')
+    logger.info('"cops_robbers_game.cop_number" called.')
+
+    if len(V) == 0:
+        return 0
+    tau, _, _ = compress_time_horizon(E, tau)
+    footprint = [tuple(e) for e in dict.fromkeys(frozenset(e)
+            for e in structural.get_static_edges(E, tau)) if len(e) == 2]
+    components = structural.get_components(V, footprint)
+
+    if structural.is_static(E, tau) and len(components) > 1:
+        number = 0
+        for component in components:
+            component_V = [u for i, u in enumerate(V) if component >> i & 1]
+            component_V_set = set(component_V)
+            component_E = [e for e in footprint if e[0] in component_V_set]
+            component_number = cop_number(component_V, component_E,
+                    max_k=None if max_k is None else max_k - number)
+            if component_number is None:
+                return None
+            number += component_number
+        return number
+
+    time_horizon, neighbourhoods = get_neighbourhoods(V, E, tau)
+    first_snapshot = [(V[i], V[j]) for i, N in enumerate(neighbourhoods[0])
+            for j in N if i < j]
+    lower_bound = len(components)
+    upper_bound = len(structural.get_greedy_dominating_set(V,
+            first_snapshot))
+    logger.info(f'Cop number between {lower_bound} and {upper_bound}.')
+
+    for k in range(lower_bound, upper_bound):
+        if max_k is not None and k > max_k:
+            return None
+        decision = structural.decide(V, E, tau, k, None)
+        if decision is not None:
+            result = decision[0]
+        else:
+            # The game graphs of the different values of k share the
+            # neighbourhoods.
+            encoder, A_gg = _get_compact_game_graph(V, neighbourhoods, k,
+                    time_horizon, symmetric=True)
+            in_attractor = reachability_game.get_vectorized_attractor(
+                    *game_graph_to_reachability_game(encoder, A_gg))
+            result = _has_winning_start(encoder, in_attractor)
+        logger.info(f'{k}-cop win: {result}.')
+        if result:
+            return k
+    if max_k is not None and upper_bound > max_k:
+        return None
+    return upper_bound
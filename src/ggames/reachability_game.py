@@ -2,44 +2,91 @@
 A reachable game is defined as (G, F) where G = (S_0, S_1, A) induced a
 directed graph (S_0 U S_1, A) and F is a subset of S_1. A is a list of pairs
 of elements of S_0 U S_1.
+
+The vertices can also be the integers 0, ..., N-1. In this case, S_0, S_1 and
+F are NumPy arrays of integers and A is a "CSRArcs" where the arcs leaving the
+vertex i are (i, targets[j]) for offsets[i] <= j < offsets[i+1].
 """
 
 import logging
+import os, time
+import collections, itertools, heapq
+import array
+import concurrent.futures
+from multiprocessing import shared_memory
+import numpy as np
+
+
+CSRArcs = collections.namedtuple('CSRArcs', ['offsets', 'targets'])
+# The arcs given by the dict "previous" mapping a vertex to the list of its
+# predecessors, and the dict "num_out_degree" of the out-degrees.
+PredecessorIndex = collections.namedtuple('PredecessorIndex',
+        ['previous', 'num_out_degree'])
 
+# The number of arcs processed at once by the functions that write their
+# arrays to memory-mapped files.
+CHUNK_SIZE = 2**20
+# The default smallest number of seconds between two checkpoints of a long
+# computation, which bounds the time spent writing them.
+CHECKPOINT_INTERVAL = 60
 
-def get_attractor(S0, S1, A, F):
+
+def get_attractor(S0, S1, A, F, previous=None, directory=None,
+        checkpoint_interval=CHECKPOINT_INTERVAL):
     """
     Compute the attractor set.
     Credit: Dietmar Berwanger in "Graph games with perfect information"
     This algorithm has been modified to not use recursion.
     :param S0: A list of vertices
     :param S1: A list of vertices (must be disjointed of S0)
-    :param A: A sub-list (subset) of S0 x S1 U S1 x S0
+    :param A: A sub-list (subset) of S0 x S1 U S1 x S0, or a
+        "PredecessorIndex" of these arcs
     :param F: A sub-list (subset) of S1 as list.
+    :param previous: The reversed arcs of a "CSRArcs" "A" (see
+        "get_predecessors"). They are computed if not given.
+    :param directory: A directory where the state of the computation on a
+        "CSRArcs" "A" is checkpointed, and from which it is resumed (see
+        "_get_compact_attractor")
+    :param checkpoint_interval: The smallest number of seconds between two
+        checkpoints
     """
     logger = logging.getLogger('main.reachability_game')
     logger.info('"reachability_game.get_attractor" called.')
+
+    if isinstance(A, CSRArcs):
+        return _get_compact_attractor(S0, S1, A, F, previous, directory,
+                checkpoint_interval)
     
     in_attractor = dict()
-    previous = dict()
-    num_out_degree = dict()
     S0_set = set(S0)
 
-    for v in S0 + S1:
-        in_attractor[v] = False
-        previous[v] = set()
-        num_out_degree[v] = 0
-    
-    for u, v in A:
-        previous[v].add(u)
-        num_out_degree[u] += 1
+    if isinstance(A, PredecessorIndex):
+        previous = A.previous
+        num_out_degree = dict(A.num_out_degree)
+        for v in itertools.chain(S0, S1):
+            in_attractor[v] = False
+    else:
+        previous = dict()
+        num_out_degree = dict()
+        for v in S0 + S1:
+            in_attractor[v] = False
+            previous[v] = set()
+            num_out_degree[v] = 0
+
+        for u, v in A:
+            previous[v].add(u)
+            num_out_degree[u] += 1
     
     propagate_stack = list(F)
     while len(propagate_stack) > 0:
         vertex = propagate_stack.pop()
+        if in_attractor[vertex]:
+            # A vertex can be pushed more than once before it is popped, but
+            # its predecessors must be counted down only once.
+            continue
         in_attractor[vertex] = True
 
-        for prev in previous[vertex]:
+        for prev in previous.get(vertex, ()):
             num_out_degree[prev] -= 1
             if (prev in S0_set or num_out_degree[prev] == 0) \
                     and not in_attractor[prev]:
@@ -49,6 +96,645 @@ def get_attractor(S0, S1, A, F):
                 if is_in_attractor]
 
 
+def get_predecessors(A, directory=None):
+    """
+    Compute the reversed arcs of the integer-encoded arcs "A". The returned
+    "CSRArcs" lists, for each vertex, the vertices that have an arc to it.
+    If "directory" is given, the reversed arcs are written by chunks of
+    "CHUNK_SIZE" arcs to the memory-mapped files 'previous_offsets.npy' and
+    'previous_targets.npy' of this directory, so "A" may be memory-mapped
+    too and only the arrays indexed by the vertices are kept in memory. The
+    files already written for "A" are reused.
+    :param A: A "CSRArcs"
+    :param directory: A directory where the reversed arcs are kept
+    """
+    if directory is not None:
+        return _get_mapped_predecessors(A, directory)
+    num_vertices = len(A.offsets) - 1
+    sources = np.repeat(np.arange(num_vertices, dtype=np.int64),
+            np.diff(A.offsets))
+    order = np.argsort(A.targets, kind='stable')
+    offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(A.targets, minlength=num_vertices),
+            out=offsets[1:])
+    return CSRArcs(offsets, sources[order])
+
+
+def _get_mapped_predecessors(A, directory):
+    """
+    Compute the reversed arcs of "get_predecessors" in memory-mapped files
+    of "directory". The arcs are sorted by a counting sort over chunks of
+    the arcs, so the sources of every vertex are in increasing order as in
+    memory. The files are filled under temporary names and renamed once
+    complete, the offsets last, so the files of an interrupted run are never
+    reused.
+    :param A: A "CSRArcs"
+    :param directory: A directory where the reversed arcs are kept
+    """
+    num_vertices = len(A.offsets) - 1
+    num_arcs = len(A.targets)
+    offsets_path = os.path.join(directory, 'previous_offsets.npy')
+    targets_path = os.path.join(directory, 'previous_targets.npy')
+    if os.path.exists(offsets_path) and os.path.exists(targets_path):
+        offsets = np.load(offsets_path, mmap_mode='r')
+        targets = np.load(targets_path, mmap_mode='r')
+        if offsets.shape == (num_vertices + 1,) \
+                and targets.shape == (num_arcs,):
+            return CSRArcs(offsets, targets)
+        del offsets, targets
+        # The offsets mark the complete files, so they go first.
+        os.remove(offsets_path)
+
+    chunks = range(0, num_arcs, CHUNK_SIZE)
+    counts = np.zeros(num_vertices, dtype=np.int64)
+    for start in chunks:
+        counts += np.bincount(A.targets[start:start+CHUNK_SIZE],
+                minlength=num_vertices)
+    offsets = np.lib.format.open_memmap(offsets_path + '.tmp', mode='w+',
+            dtype=np.int64, shape=(num_vertices + 1,))
+    offsets[0] = 0
+    np.cumsum(counts, out=offsets[1:])
+    targets = np.lib.format.open_memmap(targets_path + '.tmp', mode='w+',
+            dtype=np.int64, shape=(num_arcs,))
+    # The next free place in the list of the sources of every vertex.
+    free = np.array(offsets[:-1])
+    for start in chunks:
+        end = min(start + CHUNK_SIZE, num_arcs)
+        sources = np.searchsorted(A.offsets,
+                np.arange(start, end, dtype=np.int64), side='right') - 1
+        chunk_targets = np.asarray(A.targets[start:end])
+        order = np.argsort(chunk_targets, kind='stable')
+        chunk_targets = chunk_targets[order]
+        # The arcs to the same vertex are consecutive once sorted.
+        first = np.searchsorted(chunk_targets, chunk_targets)
+        targets[free[chunk_targets] + np.arange(end - start) - first] = \
+                sources[order]
+        vertices, vertex_counts = np.unique(chunk_targets, return_counts=True)
+        free[vertices] += vertex_counts
+    offsets.flush(); targets.flush()
+    del offsets, targets
+    os.replace(targets_path + '.tmp', targets_path)
+    os.replace(offsets_path + '.tmp', offsets_path)
+    return CSRArcs(np.load(offsets_path, mmap_mode='r'),
+            np.load(targets_path, mmap_mode='r'))
+
+
+def _get_compact_attractor(S0, S1, A, F, previous=None, directory=None,
+        checkpoint_interval=CHECKPOINT_INTERVAL):
+    """
+    Compute the attractor set of an integer-encoded reachability game. The
+    attractor is returned as a sorted NumPy array of integers.
+    If "directory" is given, the attractor flags, the out-degree counters and
+    the stack of the vertices to propagate are written to the file
+    'attractor.npz' of this directory at most every "checkpoint_interval"
+    seconds, and the computation starts from this file if it exists.
+    :param S0: A NumPy array of integers
+    :param S1: A NumPy array of integers (must be disjointed of S0)
+    :param A: A "CSRArcs" on the vertices of S0 U S1
+    :param F: A NumPy array of integers (subset of S0 U S1)
+    :param previous: The reversed arcs of "A" (see "get_predecessors")
+    :param directory: A directory where the computation is checkpointed
+    :param checkpoint_interval: The smallest number of seconds between two
+        checkpoints
+    """
+    num_vertices = len(A.offsets) - 1
+    if previous is None:
+        previous = get_predecessors(A)
+    in_S0 = np.zeros(num_vertices, dtype=bool)
+    in_S0[S0] = True
+
+    checkpoint = _load_attractor_checkpoint(directory, num_vertices)
+    if checkpoint is None:
+        num_out_degree = np.diff(A.offsets)
+        in_attractor = np.zeros(num_vertices, dtype=bool)
+        in_attractor[F] = True
+        propagate_stack = np.unique(F).tolist()
+    else:
+        num_out_degree, in_attractor, propagate_stack = checkpoint
+        logging.getLogger('main.reachability_game').info(
+                f'Attractor resumed with {len(propagate_stack)} vertices to '\
+                'propagate.')
+
+    last_checkpoint = time.monotonic()
+    while len(propagate_stack) > 0:
+        if directory is not None \
+                and time.monotonic() - last_checkpoint >= checkpoint_interval:
+            _save_attractor_checkpoint(directory, num_out_degree,
+                    in_attractor, propagate_stack)
+            last_checkpoint = time.monotonic()
+        vertex = propagate_stack.pop()
+        prev = previous.targets[
+                previous.offsets[vertex]:previous.offsets[vertex+1]]
+        np.subtract.at(num_out_degree, prev, 1)
+        prev = prev[(in_S0[prev] | (num_out_degree[prev] == 0))
+                & ~in_attractor[prev]]
+        prev = np.unique(prev)
+        in_attractor[prev] = True
+        propagate_stack.extend(prev.tolist())
+
+    if directory is not None:
+        _save_attractor_checkpoint(directory, num_out_degree, in_attractor,
+                propagate_stack)
+    return np.flatnonzero(in_attractor)
+
+
+def _load_attractor_checkpoint(directory, num_vertices):
+    """
+    Compute the triple (num_out_degree, in_attractor, propagate_stack) saved
+    in the file 'attractor.npz' of "directory", or None if there is no
+    checkpoint of a game of "num_vertices" vertices.
+    """
+    if directory is None:
+        return None
+    path = os.path.join(directory, 'attractor.npz')
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as checkpoint:
+        if checkpoint['in_attractor'].shape != (num_vertices,):
+            return None
+        return checkpoint['num_out_degree'], checkpoint['in_attractor'], \
+                checkpoint['propagate_stack'].tolist()
+
+
+def _save_attractor_checkpoint(directory, num_out_degree, in_attractor,
+        propagate_stack):
+    """
+    Write the state of "_get_compact_attractor" to the file 'attractor.npz'
+    of "directory". The file is replaced at once, so an interruption leaves
+    the previous checkpoint.
+    """
+    path = os.path.join(directory, 'attractor.npz')
+    with open(path + '.tmp', 'wb') as file:
+        np.savez(file, num_out_degree=num_out_degree,
+                in_attractor=in_attractor,
+                propagate_stack=np.array(propagate_stack, dtype=np.int64))
+    os.replace(path + '.tmp', path)
+
+
+def _gather(A, vertices):
+    """
+    Compute the concatenation of the lists of targets of the "vertices" in
+    the "CSRArcs" "A".
+    :param A: A "CSRArcs"
+    :param vertices: A NumPy array of integers
+    """
+    starts = A.offsets[vertices]
+    lengths = A.offsets[vertices+1] - starts
+    shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return A.targets[shifts + np.arange(shifts.size, dtype=np.int64)]
+
+
+def iter_attractor_levels(S0, A, F, previous=None):
+    """
+    Generate the levels of the attractor set of an integer-encoded
+    reachability game: the level 0 is F, and the level l+1 is the NumPy array
+    of the vertices attracted by the vertices of the levels up to l. The
+    vertices of a level are processed as one NumPy batch.
+    :param S0: A NumPy array of integers
+    :param A: A "CSRArcs" on the vertices of the game
+    :param F: A NumPy array of integers
+    :param previous: The reversed arcs of "A" (see "get_predecessors"). They
+        are computed if not given.
+    """
+    num_vertices = len(A.offsets) - 1
+    if previous is None:
+        previous = get_predecessors(A)
+    num_out_degree = np.diff(A.offsets)
+    in_S0 = np.zeros(num_vertices, dtype=bool)
+    in_S0[S0] = True
+    in_attractor = np.zeros(num_vertices, dtype=bool)
+    in_attractor[F] = True
+
+    frontier = np.flatnonzero(in_attractor)
+    while frontier.size > 0:
+        yield frontier
+        prev, counts = np.unique(_gather(previous, frontier),
+                return_counts=True)
+        num_out_degree[prev] -= counts
+        frontier = prev[~in_attractor[prev]
+                & (in_S0[prev] | (num_out_degree[prev] == 0))]
+        in_attractor[frontier] = True
+
+
+def get_vectorized_attractor(S0, S1, A, F, previous=None):
+    """
+    Compute the attractor set of an integer-encoded reachability game level
+    by level. The vertices attracted at the same level are processed as one
+    NumPy batch: the out-degree counters of their predecessors are decreased
+    together, then the newly attracted predecessors form the next level. The
+    attractor is returned as a boolean membership array.
+    :param S0: A NumPy array of integers
+    :param S1: A NumPy array of integers (must be disjointed of S0)
+    :param A: A "CSRArcs" on the vertices of S0 U S1
+    :param F: A NumPy array of integers (subset of S0 U S1)
+    :param previous: The reversed arcs of "A" (see "get_predecessors"). They
+        are computed if not given.
+    """
+    logger = logging.getLogger('main.reachability_game')
+    logger.info('"reachability_game.get_vectorized_attractor" called.')
+
+    in_attractor = np.zeros(len(A.offsets) - 1, dtype=bool)
+    for frontier in iter_attractor_levels(S0, A, F, previous):
+        in_attractor[frontier] = True
+
+    return in_attractor
+
+
+# The shared arrays of the attractor, attached once in every worker process.
+_worker_memories = None
+_worker_arrays = None
+
+
+def _get_arrays(memories, descriptions):
+    """
+    Compute the NumPy arrays on the shared "memories" described by
+    "descriptions", a dict that maps a name to a triple (shared memory
+    name, length, dtype).
+    """
+    return {name: np.ndarray(length, dtype=dtype, buffer=memories[name].buf)
+            for name, (_, length, dtype) in descriptions.items()}
+
+
+def _init_worker_arrays(descriptions):
+    global _worker_memories, _worker_arrays
+    # The memories are kept open as long as the worker lives.
+    _worker_memories = {name: shared_memory.SharedMemory(name=memory_name)
+            for name, (memory_name, _, _) in descriptions.items()}
+    _worker_arrays = _get_arrays(_worker_memories, descriptions)
+
+
+def _gather_predecessors(start, end, region):
+    """
+    Write the sorted predecessors of frontier[start:end] and their numbers
+    of arcs to the frontier from the index "region" of the shared scratch
+    arrays. Return the number of predecessors written.
+    """
+    arrays = _worker_arrays
+    previous = CSRArcs(arrays['previous_offsets'], arrays['previous_targets'])
+    prev, counts = np.unique(_gather(previous, arrays['frontier'][start:end]),
+            return_counts=True)
+    arrays['prev'][region:region+prev.size] = prev
+    arrays['counts'][region:region+prev.size] = counts
+    return prev.size
+
+
+def _attract_partition(first, last, regions):
+    """
+    Decrease the out-degree counters of the vertices first, ..., last-1 by
+    the numbers of arcs gathered in the "regions" of the scratch arrays, and
+    write the newly attracted vertices from the index "first" of the shared
+    array "next". Only this worker writes the counters and the flags of its
+    partition, so no lock is needed. Return the number of vertices written.
+    """
+    arrays = _worker_arrays
+    num_out_degree = arrays['num_out_degree']
+    candidates = []
+    for region, size in regions:
+        prev = arrays['prev'][region:region+size]
+        start, end = np.searchsorted(prev, [first, last])
+        num_out_degree[prev[start:end]] -= \
+                arrays['counts'][region+start:region+end]
+        candidates.append(prev[start:end])
+    prev = np.unique(np.concatenate(candidates))
+    attracted = prev[~arrays['in_attractor'][prev]
+            & (arrays['in_S0'][prev] | (num_out_degree[prev] == 0))]
+    arrays['in_attractor'][attracted] = True
+    arrays['next'][first:first+attracted.size] = attracted
+    return attracted.size
+
+
+def get_parallel_attractor(S0, S1, A, F, workers=None):
+    """
+    Compute the attractor set of an integer-encoded reachability game on
+    "workers" processes. The reversed arcs, the out-degree counters and the
+    attractor flags are kept in shared memory, and the vertices are split in
+    as many ranges as workers. The levels are computed as in
+    "iter_attractor_levels", each in two synchronized steps: the workers
+    first gather the predecessors of their share of the level, then each
+    worker decreases the counters of the predecessors in its range and
+    flags the newly attracted ones. The attractor is returned as a sorted
+    NumPy array, as "get_attractor" does.
+    :param S0: A NumPy array of integers
+    :param S1: A NumPy array of integers (must be disjointed of S0)
+    :param A: A "CSRArcs" on the vertices of S0 U S1
+    :param F: A NumPy array of integers (subset of S0 U S1)
+    :param workers: The number of worker processes, by default the number
+        of processors
+    """
+    logger = logging.getLogger('main.reachability_game')
+    logger.info('"reachability_game.get_parallel_attractor" called.')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    num_vertices = len(A.offsets) - 1
+    previous = get_predecessors(A)
+    in_S0 = np.zeros(num_vertices, dtype=bool)
+    in_S0[S0] = True
+    in_attractor = np.zeros(num_vertices, dtype=bool)
+    in_attractor[F] = True
+    initial = {'previous_offsets': previous.offsets,
+            'previous_targets': previous.targets,
+            'num_out_degree': np.diff(A.offsets), 'in_S0': in_S0,
+            'in_attractor': in_attractor,
+            'frontier': np.zeros(num_vertices, dtype=np.int64),
+            'next': np.zeros(num_vertices, dtype=np.int64),
+            # A level gathers at most one predecessor per arc.
+            'prev': np.zeros(previous.targets.size, dtype=np.int64),
+            'counts': np.zeros(previous.targets.size, dtype=np.int64)}
+
+    memories = dict()
+    try:
+        descriptions = dict()
+        for name, values in initial.items():
+            memories[name] = shared_memory.SharedMemory(create=True,
+                    size=max(1, values.nbytes))
+            descriptions[name] = memories[name].name, values.size, \
+                    values.dtype.str
+        arrays = _get_arrays(memories, descriptions)
+        for name, values in initial.items():
+            arrays[name][:] = values
+        del initial, in_S0, in_attractor
+
+        bounds = [num_vertices * i // workers for i in range(workers + 1)]
+        frontier = np.flatnonzero(arrays['in_attractor'])
+        with concurrent.futures.ProcessPoolExecutor(workers,
+                initializer=_init_worker_arrays,
+                initargs=(descriptions,)) as executor:
+            while frontier.size > 0:
+                arrays['frontier'][:frontier.size] = frontier
+                # The scratch regions of the shares of the level are bounded
+                # by their numbers of arcs.
+                chunks = [frontier.size * i // workers
+                        for i in range(workers + 1)]
+                in_degrees = previous.offsets[frontier+1] \
+                        - previous.offsets[frontier]
+                regions = np.zeros(workers + 1, dtype=np.int64)
+                np.cumsum(np.add.reduceat(in_degrees, chunks[:-1])
+                        * (np.diff(chunks) > 0), out=regions[1:])
+                sizes = [future.result() for future in [
+                        executor.submit(_gather_predecessors, chunks[i],
+                        chunks[i+1], int(regions[i]))
+                        for i in range(workers)]]
+                filled = list(zip(map(int, regions[:-1]), sizes))
+                sizes = [future.result() for future in [
+                        executor.submit(_attract_partition, bounds[i],
+                        bounds[i+1], filled) for i in range(workers)]]
+                frontier = np.concatenate([
+                        arrays['next'][bounds[i]:bounds[i]+sizes[i]]
+                        for i in range(workers)])
+
+        attractor = np.flatnonzero(arrays['in_attractor'])
+        del arrays, frontier
+    finally:
+        for memory in memories.values():
+            memory.close()
+            memory.unlink()
+    return attractor
+
+
+def get_attractor_ranks(S0, S1, A, F):
+    """
+    Compute the rank of every vertex in the attractor set, that is the
+    number of moves in which the player 0 can force the token into F from
+    it: the vertices of F have the rank 0, a vertex of S0 has one more than
+    its smallest ranked successor, and a vertex of S1 one more than its
+    largest ranked successor. The vertices are attracted level by level, so
+    the ranks come at no extra cost.
+    If the game is integer-encoded, the ranks are returned as a NumPy array
+    where the vertices out of the attractor have the rank -1. Otherwise, they
+    are returned as a dict over the vertices of the attractor.
+    :param S0: A list of vertices
+    :param S1: A list of vertices (must be disjointed of S0)
+    :param A: A sub-list (subset) of S0 x S1 U S1 x S0, a "PredecessorIndex"
+        of these arcs or a "CSRArcs"
+    :param F: A sub-list (subset) of S0 U S1
+    """
+    logger = logging.getLogger('main.reachability_game')
+    logger.info('"reachability_game.get_attractor_ranks" called.')
+
+    if isinstance(A, CSRArcs):
+        ranks = np.full(len(A.offsets) - 1, -1, dtype=np.int64)
+        for rank, frontier in enumerate(iter_attractor_levels(S0, A, F)):
+            ranks[frontier] = rank
+        return ranks
+
+    if isinstance(A, PredecessorIndex):
+        previous = A.previous
+        num_out_degree = dict(A.num_out_degree)
+    else:
+        previous = collections.defaultdict(set)
+        num_out_degree = {v: 0 for v in itertools.chain(S0, S1)}
+        for u, v in A:
+            previous[v].add(u)
+            num_out_degree[u] += 1
+    S0_set = set(S0)
+
+    ranks = {vertex: 0 for vertex in F}
+    frontier = list(ranks)
+    rank = 0
+    while len(frontier) > 0:
+        rank += 1
+        next_frontier = []
+        for vertex in frontier:
+            for prev in previous.get(vertex, ()):
+                num_out_degree[prev] -= 1
+                if prev not in ranks and (prev in S0_set
+                        or num_out_degree[prev] == 0):
+                    ranks[prev] = rank
+                    next_frontier.append(prev)
+        frontier = next_frontier
+    return ranks
+
+
+def replace_arcs(A, replaced):
+    """
+    Compute the "CSRArcs" "A" where the arcs leaving the vertices of the dict
+    "replaced" are replaced by the arcs to the vertices of their NumPy
+    arrays. The arcs of the other vertices are copied as one block.
+    :param A: A "CSRArcs"
+    :param replaced: A dict that maps a vertex to the array of its new
+        successors
+    """
+    num_vertices = len(A.offsets) - 1
+    vertices = np.array(sorted(replaced), dtype=np.int64)
+    is_replaced = np.zeros(num_vertices, dtype=bool)
+    is_replaced[vertices] = True
+    degrees = np.diff(A.offsets)
+    new_degrees = degrees.copy()
+    new_degrees[vertices] = [len(replaced[v]) for v in vertices.tolist()]
+    offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(new_degrees, out=offsets[1:])
+    targets = np.empty(offsets[-1], dtype=np.int64)
+    targets[~np.repeat(is_replaced, new_degrees)] = \
+            A.targets[~np.repeat(is_replaced, degrees)]
+    targets[np.repeat(is_replaced, new_degrees)] = np.concatenate(
+            [np.zeros(0, dtype=np.int64)]
+            + [replaced[v] for v in vertices.tolist()])
+    return CSRArcs(offsets, targets)
+
+
+def update_attractor_ranks(S0, A, ranks, changed, previous=None):
+    """
+    Compute the ranks of "get_attractor_ranks" of an integer-encoded game
+    whose arcs leaving the vertices "changed" were replaced, from the ranks
+    "ranks" before the change. Only the vertices whose rank may change are
+    visited: first, the ranks that may grow are forgotten, from the vertices
+    "changed" back through the vertices of S0 whose smallest ranked
+    successor they are and the vertices of S1 they lead to. Then the
+    forgotten and changed vertices are ranked again from their successors
+    in the order of their ranks, as in the algorithm of Dijkstra, and the
+    ranks that decrease are propagated to the predecessors. Return the new
+    ranks and the number of vertices visited.
+    :param S0: A NumPy array of integers
+    :param A: The "CSRArcs" after the change
+    :param ranks: The ranks before the change, -1 out of the attractor
+    :param changed: The vertices whose arcs were replaced
+    :param previous: The reversed arcs of "A" (see "get_predecessors"). They
+        are computed if not given.
+    """
+    if previous is None:
+        previous = get_predecessors(A)
+    in_S0 = np.zeros(len(A.offsets) - 1, dtype=bool)
+    in_S0[S0] = True
+    ranks = np.array(ranks, dtype=np.int64)
+
+    def get_predecessors_of(vertex):
+        return previous.targets[
+                previous.offsets[vertex]:previous.offsets[vertex+1]].tolist()
+
+    def get_rank(vertex):
+        # The rank given by the current ranks of the successors.
+        successor_ranks = ranks[A.targets[A.offsets[vertex]:
+                A.offsets[vertex+1]]]
+        if in_S0[vertex]:
+            known = successor_ranks[successor_ranks >= 0]
+            return int(known.min()) + 1 if known.size > 0 else -1
+        if successor_ranks.size > 0 and successor_ranks.min() >= 0:
+            return int(successor_ranks.max()) + 1
+        return -1
+
+    # The vertices of F keep the rank 0 whatever their arcs.
+    changed = [vertex for vertex in np.unique(changed).tolist()
+            if ranks[vertex] != 0]
+    forgotten = set()
+    stack = [vertex for vertex in changed if ranks[vertex] > 0]
+    while len(stack) > 0:
+        vertex = stack.pop()
+        if vertex in forgotten:
+            continue
+        forgotten.add(vertex)
+        for prev in get_predecessors_of(vertex):
+            if prev not in forgotten and ranks[prev] > 0 and (
+                    not in_S0[prev] or ranks[prev] == ranks[vertex] + 1):
+                stack.append(prev)
+    ranks[list(forgotten)] = -1
+
+    visited = forgotten.union(changed)
+    tentative = dict()
+    heap = []
+    for vertex in visited:
+        rank = get_rank(vertex)
+        if rank >= 0:
+            tentative[vertex] = rank
+            heap.append((rank, vertex))
+    heapq.heapify(heap)
+    while len(heap) > 0:
+        rank, vertex = heapq.heappop(heap)
+        if tentative.get(vertex) != rank:
+            continue
+        del tentative[vertex]
+        ranks[vertex] = rank
+        for prev in get_predecessors_of(vertex):
+            if ranks[prev] == 0:
+                continue
+            visited.add(prev)
+            current = tentative.get(prev, ranks[prev])
+            new_rank = rank + 1 if in_S0[prev] else get_rank(prev)
+            if new_rank >= 0 and (current < 0 or new_rank < current):
+                tentative[prev] = new_rank
+                heapq.heappush(heap, (new_rank, prev))
+    return ranks, len(visited)
+
+
+def get_reachable(A, initial):
+    """
+    Compute the vertices reachable from the vertices "initial" through the
+    integer-encoded arcs "A", as a boolean membership array.
+    :param A: A "CSRArcs"
+    :param initial: A NumPy array of integers
+    """
+    reachable = np.zeros(len(A.offsets) - 1, dtype=bool)
+    reachable[initial] = True
+    frontier = np.flatnonzero(reachable)
+    while frontier.size > 0:
+        successors = np.unique(_gather(A, frontier))
+        frontier = successors[~reachable[successors]]
+        reachable[frontier] = True
+    return reachable
+
+
+def get_subgame(S0, S1, A, F, kept):
+    """
+    Compute the integer-encoded reachability game induced by the vertices
+    "kept", which must contain the successors of its vertices. The kept
+    vertices are numbered again in increasing order. Return the sub-game
+    (S0, S1, A, F) and the NumPy array of the kept vertices, which maps the
+    new numbers to the former ones.
+    :param S0: A NumPy array of integers
+    :param S1: A NumPy array of integers (must be disjointed of S0)
+    :param A: A "CSRArcs" on the vertices of S0 U S1
+    :param F: A NumPy array of integers (subset of S0 U S1)
+    :param kept: A boolean membership array
+    """
+    vertices = np.flatnonzero(kept)
+    new_index = np.cumsum(kept) - 1
+    offsets = np.zeros(vertices.size + 1, dtype=np.int64)
+    np.cumsum(A.offsets[vertices+1] - A.offsets[vertices], out=offsets[1:])
+    targets = new_index[_gather(A, vertices)]
+    return (new_index[S0[kept[S0]]], new_index[S1[kept[S1]]],
+            CSRArcs(offsets, targets), new_index[F[kept[F]]]), vertices
+
+
+def get_implicit_attractor(game):
+    """
+    Compute the attractor set of an integer-encoded reachability game whose
+    arcs are computed on request. Only a counter and a flag are stored for
+    each vertex: the out-degree of a vertex of S1 is computed the first time
+    one of its successors is attracted. The attractor is returned as a
+    boolean membership array.
+    :param game: An object with the attribute "num_vertices" and the methods
+        "targets()", giving F, "is_player0(v)", telling if v is in S0,
+        "out_degree(v)" and "predecessors(v)"
+    """
+    logger = logging.getLogger('main.reachability_game')
+    logger.info('"reachability_game.get_implicit_attractor" called.')
+
+    in_attractor = bytearray(game.num_vertices)
+    # The counters of the vertices not yet reached are -1.
+    num_out_degree = array.array('i', [-1]) * game.num_vertices
+
+    propagate_stack = []
+    for vertex in game.targets().tolist():
+        if not in_attractor[vertex]:
+            in_attractor[vertex] = True
+            propagate_stack.append(vertex)
+    while len(propagate_stack) > 0:
+        vertex = propagate_stack.pop()
+        for prev in game.predecessors(vertex):
+            if in_attractor[prev]:
+                continue
+            if not game.is_player0(prev):
+                if num_out_degree[prev] < 0:
+                    num_out_degree[prev] = game.out_degree(prev)
+                num_out_degree[prev] -= 1
+                if num_out_degree[prev] > 0:
+                    continue
+            in_attractor[prev] = True
+            propagate_stack.append(prev)
+
+    return np.frombuffer(in_attractor, dtype=bool)
+
+
 def get_next_winning_moves(current_vertex, A, attractor, player0_move=True):
     """
     Compute a list of next moves that lead to a winning game for the player 0
@@ -69,3 +755,146 @@ def get_next_winning_moves(current_vertex, A, attractor, player0_move=True):
     else:
         return [v for u, v in A if u == current_vertex and
             v not in attractor_set]
+
+
+class Strategy:
+    """
+    The winning moves of both players in the game (S0, S1, A) with the
+    attractor "attractor", indexed once so that a query only reads the
+    successors of its vertex. The winning moves of a vertex of S0 are the
+    arcs into the attractor, and those of a vertex of S1 are the arcs out of
+    it, as in "get_next_winning_moves". If the game is integer-encoded, the
+    tables are "CSRArcs" and "attractor" is either the array of its vertices
+    or its boolean membership array. If the "ranks" of the attractor are
+    given (see "get_attractor_ranks"), the fastest moves are available too:
+    the player 0 moves to a successor of the smallest rank, and the player 1
+    delays to a successor of the largest rank.
+    :param S0: A list of vertices
+    :param S1: A list of vertices (must be disjointed of S0)
+    :param A: A sub-list (subset) of S0 x S1 U S1 x S0, or a "CSRArcs"
+    :param attractor: The attractor set of the game
+    :param F: The vertices where a play stops, if any
+    :param ranks: The ranks of the vertices of the attractor, if any
+    """
+
+    def __init__(self, S0, S1, A, attractor, F=None, ranks=None):
+        self.ranks = ranks
+        self.compact = isinstance(A, CSRArcs)
+        if self.compact:
+            num_vertices = A.offsets.size - 1
+            self.in_attractor = np.zeros(num_vertices, dtype=bool)
+            self.in_attractor[attractor] = True
+            self.is_player0 = np.zeros(num_vertices, dtype=bool)
+            self.is_player0[S0] = True
+            self.in_F = np.zeros(num_vertices, dtype=bool)
+            if F is not None:
+                self.in_F[F] = True
+            self.successors = A
+            sources = np.repeat(np.arange(num_vertices, dtype=np.int64),
+                    np.diff(A.offsets))
+            winning = self.in_attractor[A.targets] == self.is_player0[sources]
+            offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+            np.cumsum(np.bincount(sources[winning], minlength=num_vertices),
+                    out=offsets[1:])
+            self.winning_moves = CSRArcs(offsets, A.targets[winning])
+        else:
+            self.in_attractor = set(attractor)
+            self.is_player0 = set(S0)
+            self.in_F = set(F) if F is not None else set()
+            self.successors = {u: [] for u in itertools.chain(S0, S1)}
+            for u, v in A:
+                self.successors[u].append(v)
+            self.winning_moves = {u: [v for v in successors
+                    if (v in self.in_attractor) == (u in self.is_player0)]
+                    for u, successors in self.successors.items()}
+
+    def _get(self, table, vertex):
+        if self.compact:
+            return table.targets[table.offsets[vertex]:table.offsets[vertex+1]]
+        return table[vertex]
+
+    def get_successors(self, vertex):
+        """
+        Compute the successors of the vertex "vertex".
+        :param vertex: A vertex
+        """
+        return self._get(self.successors, vertex)
+
+    def get_next_winning_moves(self, vertex, player0_move=None):
+        """
+        Compute the list of the next moves from "vertex" that lead to a
+        winning game for the player 0 if "player0_move", and for the player 1
+        otherwise. By default, the player is the one whose turn it is, and
+        the moves are read from the precomputed table.
+        :param vertex: A vertex
+        :param player0_move: A flag meaning that it's player 0's turn to play.
+        """
+        is_player0 = bool(self.is_player0[vertex]) if self.compact \
+                else vertex in self.is_player0
+        if player0_move is None or player0_move == is_player0:
+            return list(self._get(self.winning_moves, vertex))
+        if self.compact:
+            successors = self._get(self.successors, vertex)
+            return list(successors[self.in_attractor[successors]
+                    == player0_move])
+        return [v for v in self.successors[vertex]
+                if (v in self.in_attractor) == player0_move]
+
+    def _get_rank(self, vertex):
+        if self.compact:
+            return int(self.ranks[vertex])
+        return self.ranks.get(vertex, -1)
+
+    def get_fastest_moves(self, vertex):
+        """
+        Compute the list of the next moves from "vertex" in the attractor
+        that lead to F the fastest if the player 0 plays, and the slowest if
+        the player 1 plays, that is the successors of rank one less. Out of
+        the attractor, these are the winning moves.
+        :param vertex: A vertex
+        """
+        rank = self._get_rank(vertex)
+        moves = self._get(self.successors, vertex)
+        if rank < 0:
+            return list(self._get(self.winning_moves, vertex))
+        if self.compact:
+            return list(moves[self.ranks[moves] == rank - 1])
+        return [v for v in moves if self.ranks.get(v, -1) == rank - 1]
+
+    def play(self, start, choose=None, max_length=None):
+        """
+        Compute the trace of the play from the vertex "start" where both
+        players follow their winning moves, or any move when they have none.
+        The play stops at a vertex of F, at a vertex without successor, or
+        after "max_length" moves, by default the number of vertices. If the
+        ranks are given, the players follow their fastest moves in the
+        attractor, so the token reaches F in as many moves as the rank of
+        "start". Otherwise, the moves into the attractor keep the player 0
+        winning but do not always bring the token closer to F.
+        :param start: A vertex
+        :param choose: A function returning the next vertex from the current
+            vertex and the list of its candidate moves. Defaults to the first
+            candidate.
+        :param max_length: The largest number of moves
+        """
+        if choose is None: choose = lambda vertex, moves: moves[0]
+        if max_length is None:
+            max_length = self.successors.offsets.size - 1 if self.compact \
+                    else len(self.successors)
+        trace = [start]
+        vertex = start
+        for _ in range(max_length):
+            if vertex in self.in_F if not self.compact \
+                    else self.in_F[vertex]:
+                break
+            if self.ranks is not None:
+                moves = self.get_fastest_moves(vertex)
+            else:
+                moves = self._get(self.winning_moves, vertex)
+            if len(moves) == 0:
+                moves = self._get(self.successors, vertex)
+                if len(moves) == 0:
+                    break
+            vertex = choose(vertex, moves)
+            trace.append(vertex)
+        return trace
@@ -0,0 +1,246 @@
+"""
+Some instances of the Cops and Robbers game can be decided from the structure
+of the graph (V, E, tau), without building the game graph. The sets of
+vertices are represented by bitsets, that is integers where the bit i is set
+if V[i] is in the set.
+"""
+
+
+import logging
+import math, itertools
+
+
+# The largest number of sets of k vertices tried by the dominating set rule.
+MAX_DOMINATING_SET_CANDIDATES = 100000
+
+
+def get_primitive_pattern(edge_pattern):
+    """
+    Compute the shortest pattern whose repetition gives "edge_pattern", so
+    that both describe the same presence function. For example, the
+    primitive pattern of '1010' is '10' and the one of '111' is '1'.
+    :param edge_pattern: A binary string
+    """
+    # The smallest period of a string is the first position where it occurs
+    # in itself repeated twice.
+    period = (edge_pattern + edge_pattern).find(edge_pattern, 1)
+    if len(edge_pattern) % period == 0:
+        return edge_pattern[:period]
+    return edge_pattern
+
+
+def is_static(E, tau=None):
+    """
+    Compute if the edge periodic graph with the edges "E" and the presence
+    function "tau" is static, that is if every edge is either always present
+    or never present.
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    """
+    if tau is None:
+        return True
+    return all(len(set(edge_pattern)) == 1 for edge_pattern in tau.values())
+
+
+def get_static_edges(E, tau=None):
+    """
+    Compute the list of the edges of a static graph that are present.
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    """
+    if tau is None:
+        return list(E)
+    return [e for e, edge_pattern in tau.items() if '1' in edge_pattern]
+
+
+def get_closed_neighbourhoods(V, E):
+    """
+    Compute the closed neighbourhoods of the vertices of the static graph
+    (V, E) as a list of bitsets.
+    :param V: The list of vertices
+    :param E: The list of edges
+    """
+    vertex_index = {u: index for index, u in enumerate(V)}
+    neighbourhoods = [1 << i for i in range(len(V))]
+    for u, v in E:
+        i = vertex_index[u]; j = vertex_index[v]
+        neighbourhoods[i] |= 1 << j
+        neighbourhoods[j] |= 1 << i
+    return neighbourhoods
+
+
+def is_dismantlable(V, E):
+    """
+    Compute if the static graph (V, E) is dismantlable, that is if it can be
+    reduced to a single vertex by repeatedly removing a dominated vertex: a
+    vertex whose closed neighbourhood is included in the closed
+    neighbourhood of another vertex. A static graph is 1-cop win if and only
+    if it is dismantlable.
+    Credit: Nowakowski and Winkler in "Vertex-to-vertex pursuit in a graph"
+    :param V: The list of vertices
+    :param E: The list of edges
+    """
+    logger = logging.getLogger('main.structural')
+    logger.info('"structural.is_dismantlable" called.')
+
+    neighbourhoods = get_closed_neighbourhoods(V, E)
+    remaining = set(range(len(V)))
+    alive = (1 << len(V)) - 1
+    removed = True
+    while removed and len(remaining) > 1:
+        removed = False
+        for u in list(remaining):
+            neighbourhood = neighbourhoods[u] & alive
+            if any(v != u and neighbourhood & ~neighbourhoods[v] == 0
+                    for v in remaining):
+                # Removing a dominated vertex keeps the graph dismantlable
+                # if and only if it was.
+                remaining.remove(u)
+                alive &= ~(1 << u)
+                removed = True
+                if len(remaining) == 1:
+                    break
+    return len(remaining) == 1
+
+
+def get_components(V, E):
+    """
+    Compute the connected components of the static graph (V, E) as a list
+    of bitsets.
+    :param V: The list of vertices
+    :param E: The list of edges
+    """
+    neighbourhoods = get_closed_neighbourhoods(V, E)
+    components = []
+    unvisited = (1 << len(V)) - 1
+    while unvisited:
+        component = unvisited & -unvisited
+        frontier = component
+        while frontier:
+            i = frontier.bit_length() - 1
+            frontier &= ~(1 << i)
+            new = neighbourhoods[i] & ~component
+            component |= new
+            frontier |= new
+        components.append(component)
+        unvisited &= ~component
+    return components
+
+
+def has_dominating_set(V, E, k):
+    """
+    Compute if the static graph (V, E) has a dominating set of at most "k"
+    vertices. Return None if there are too many sets of "k" vertices to try
+    (see "MAX_DOMINATING_SET_CANDIDATES").
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param k: The number of vertices in the dominating set
+    """
+    k = min(k, len(V))
+    if math.comb(len(V), k) > MAX_DOMINATING_SET_CANDIDATES:
+        return None
+    neighbourhoods = get_closed_neighbourhoods(V, E)
+    everything = (1 << len(V)) - 1
+    for vertices in itertools.combinations(neighbourhoods, k):
+        dominated = 0
+        for neighbourhood in vertices:
+            dominated |= neighbourhood
+        if dominated == everything:
+            return True
+    return False
+
+
+def get_greedy_dominating_set(V, E):
+    """
+    Compute a dominating set of the static graph (V, E) by repeatedly
+    choosing the vertex that dominates the most vertices not yet dominated.
+    The set is not always the smallest one, but it is found in polynomial
+    time.
+    :param V: The list of vertices
+    :param E: The list of edges
+    """
+    neighbourhoods = get_closed_neighbourhoods(V, E)
+    undominated = (1 << len(V)) - 1
+    dominating_set = []
+    while undominated:
+        i = max(range(len(V)), key=lambda i:
+                bin(neighbourhoods[i] & undominated).count('1'))
+        dominating_set.append(V[i])
+        undominated &= ~neighbourhoods[i]
+    return dominating_set
+
+
+def _decide_components(V, E, components, k, solve):
+    """
+    Decide if the disconnected static graph (V, E) is "k"-cop win by solving
+    its components independently. The robber chooses his component after the
+    cops are placed, so every component needs enough cops to win on its own:
+    the graph is "k"-cop win if and only if the smallest numbers of cops
+    winning on the components sum to at most "k".
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param components: The connected components as bitsets
+    :param k: The number of cops
+    :param solve: A function deciding if a static graph (V, E) is k-cop win
+    """
+    num_cops = 0
+    for index, component in enumerate(components):
+        component_V = [u for i, u in enumerate(V) if component >> i & 1]
+        component_V_set = set(component_V)
+        component_E = [e for e in E if e[0] in component_V_set]
+        # Every other component needs at least one cop.
+        max_num_cops = k - num_cops - (len(components) - index - 1)
+        for component_k in range(1, max_num_cops + 1):
+            if solve(component_V, component_E, component_k):
+                num_cops += component_k
+                break
+        else:
+            return False
+    return True
+
+
+def decide(V, E, tau, k, solve):
+    """
+    Try to decide if the graph (V, E, tau) is "k"-cop win from its structure
+    only. Return a pair (result, rule) where "rule" is the name of the rule
+    that decided the instance, or None if no rule applies. The rules are:
+    - 'no_cops': there is no cop, so the robber is never captured;
+    - 'enough_cops': there are at least as many cops as vertices;
+    - 'components': a static disconnected graph, whose components are
+      decided by "solve";
+    - 'complete': a static complete graph;
+    - 'tree': a static tree;
+    - 'dismantlable': a static graph with one cop (see "is_dismantlable");
+    - 'dominating_set': a static graph with a dominating set of k vertices.
+    :param V: The list of vertices
+    :param E: The list of edges
+    :param tau: The presence function of the edges in E in dict
+    :param k: The number of cops
+    :param solve: A function deciding if a static graph (V, E) is k-cop win
+    """
+    n = len(V)
+    if n == 0:
+        return None
+    if k < 1:
+        return False, 'no_cops'
+    if k >= n:
+        return True, 'enough_cops'
+    if not is_static(E, tau):
+        return None
+
+    E = [tuple(e) for e in dict.fromkeys(frozenset(e)
+            for e in get_static_edges(E, tau)) if len(e) == 2]
+    components = get_components(V, E)
+    if len(components) > 1:
+        if len(components) > k:
+            return False, 'components'
+        return _decide_components(V, E, components, k, solve), 'components'
+    if 2 * len(E) == n * (n-1):
+        return True, 'complete'
+    if len(E) == n - 1:
+        return True, 'tree'
+    if k == 1:
+        return is_dismantlable(V, E), 'dismantlable'
+    if has_dominating_set(V, E, k):
+        return True, 'dominating_set'
+    return None
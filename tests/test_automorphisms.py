@@ -0,0 +1,85 @@
+from ggames.automorphisms import *
+from ggames.automorphisms import _get_colored_adjacency, _is_automorphism
+
+
+def get_group(n, generators):
+    group = {tuple(range(n))}
+    stack = list(group)
+    while len(stack) > 0:
+        h = stack.pop()
+        for g in generators:
+            gh = tuple(g[h[i]] for i in range(n))
+            if gh not in group:
+                group.add(gh)
+                stack.append(gh)
+    return group
+
+
+# C6
+n = 6
+V = list(range(n))
+E = [(i, (i+1)%n) for i in range(n)]
+C6 = V, E
+
+# d_C6, the presence patterns break the rotations of odd length.
+tau = {(i, (i+1)%n): '01' if i%2 else '10' for i in range(n)}
+d_C6 = V, E, tau
+
+# Torus 4x4
+V = [(i, j) for i in range(4) for j in range(4)]
+E = [((i, j), ((i+1)%4, j)) for i in range(4) for j in range(4)] \
+        + [((i, j), (i, (j+1)%4)) for i in range(4) for j in range(4)]
+T44 = V, E
+
+# P3 with a pattern that unrolls to the one of the other edge.
+V = [1, 2, 3]
+E = [(1, 2), (2, 3)]
+tau = {(1, 2): '1010', (2, 3): '10'}
+d_P3 = V, E, tau
+
+
+def test_get_automorphisms():
+    generators = get_automorphisms(*C6)
+    adjacency = _get_colored_adjacency(*C6)
+    for g in generators:
+        assert _is_automorphism(adjacency, g)
+    assert len(get_group(6, generators)) == 12
+
+    generators = get_automorphisms(*d_C6)
+    assert len(get_group(6, generators)) == 6
+
+    generators = get_automorphisms(*T44)
+    assert len(get_group(16, generators)) == 384
+
+    generators = get_automorphisms(*d_P3)
+    assert get_group(3, generators) == {(0, 1, 2), (2, 1, 0)}
+
+
+def test_get_orbit():
+    generators = get_automorphisms(*d_P3)
+    assert get_orbit(0, generators) == {0, 2}
+    assert get_orbit(1, generators) == {1}
+    assert get_orbit(0, []) == {0}
+
+
+def test_get_canonical_labelling():
+    def relabel(V, E, labelling):
+        index = {u: labelling[i] for i, u in enumerate(V)}
+        return sorted(tuple(sorted((index[u], index[v]))) for u, v in E)
+
+    # Relabelling and reordering C6 gives the same relabelled graph.
+    V, E = C6
+    labelling, complete = get_canonical_labelling(V, E)
+    assert complete and sorted(labelling) == V
+    V2 = [5, 3, 1, 0, 2, 4]
+    E2 = [(3, 5), (1, 3), (0, 1), (0, 2), (4, 2), (4, 5)]
+    labelling2, _ = get_canonical_labelling(V2, E2)
+    assert relabel(V, E, labelling) == relabel(V2, E2, labelling2)
+
+    # C6 and two C3 are 2-regular, so the vertices of C6 and of the C3 are
+    # only told apart at the leaves.
+    V = list(range(12))
+    E = [(i, (i+1)%6) for i in range(6)] \
+            + [(6, 7), (7, 8), (8, 6), (9, 10), (10, 11), (11, 9)]
+    assert get_canonical_labelling(V, E)[1]
+    assert not get_canonical_labelling(V, E, max_leaves=1)[1]
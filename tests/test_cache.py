@@ -0,0 +1,53 @@
+from ggames.cache import *
+import os
+import tempfile
+
+
+# P3 with a repeated pattern
+V = [1, 2, 3]
+E = [(1, 2), (2, 3)]
+tau = {(1, 2): '1010', (2, 3): '1'}
+d_P3 = V, E, tau
+
+# The same graph relabelled, with the edges reordered and reoriented
+V = ['c', 'a', 'b']
+E = [('b', 'a'), ('a', 'c')]
+tau = {('b', 'a'): '1', ('a', 'c'): '10'}
+d_P3_relabelled = V, E, tau
+
+
+def test_normalize_graph():
+    assert normalize_graph(*d_P3) == {(1, 2): '10', (2, 3): '1'}
+    assert normalize_graph([1, 2, 3], [(1, 2), (2, 1), (3, 3)],
+            {(1, 2): '10', (2, 1): '001', (3, 3): '1'}) \
+            == {(1, 2): '101011'}
+    assert normalize_graph([1, 2], [(1, 2)], {(1, 2): '00'}) == dict()
+
+
+def test_get_fingerprint():
+    assert get_fingerprint(*d_P3, k=1) == get_fingerprint(*d_P3_relabelled,
+            k=1)
+    assert get_fingerprint(*d_P3, k=1) != get_fingerprint(*d_P3, k=2)
+    assert get_fingerprint(*d_P3[:2]) != get_fingerprint(*d_P3)
+
+
+def test_result_cache():
+    directory = tempfile.TemporaryDirectory()
+    cache = ResultCache(os.path.join(directory.name, 'cache.db'),
+            max_entries=2)
+    assert cache.get('a') is None
+    cache.put('a', True)
+    cache.put('b', False)
+    assert cache.get('a') is True
+    assert cache.get('b') is False
+    # 'a' is the least recently used result.
+    cache.put('c', True)
+    assert len(cache) == 2
+    assert cache.get('a') is None
+    assert (cache.hits, cache.misses) == (2, 2)
+    cache.close()
+
+    cache = ResultCache(os.path.join(directory.name, 'cache.db'))
+    assert cache.get('c') is True
+    cache.close()
+    directory.cleanup()
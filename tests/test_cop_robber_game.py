@@ -1,4 +1,10 @@
 from ggames.cops_robbers_game import *
+from ggames.cache import ResultCache, get_fingerprint
+from ggames import reachability_game
+import os
+import tempfile
+import json
+import numpy as np
 
 
 # K2
@@ -209,6 +215,25 @@ d_P2_rg = S0, S1, A, F
 
 
 
+def test_compress_time_horizon():
+    E = [(1, 2), (2, 3), (3, 4)]
+    tau = {(1, 2): '1010', (2, 3): '111', (3, 4): '011011'}
+    assert compress_time_horizon(E, tau) == ({(1, 2): '10', (2, 3): '1',
+            (3, 4): '011'}, 12, 6)
+    assert compress_time_horizon(E) == ({e: '1' for e in E}, 1, 1)
+
+
+def test_get_neighbourhoods():
+    time_horizon, neighbourhoods = get_neighbourhoods(*d_P2)
+    assert time_horizon == 2
+    assert neighbourhoods == [[[0, 1], [0, 1], [2]],
+                              [[0, 1], [0, 1, 2], [1, 2]]]
+
+    time_horizon, neighbourhoods = get_neighbourhoods(*C4)
+    assert time_horizon == 1
+    assert neighbourhoods == [[[0, 1, 3], [0, 1, 2], [1, 2, 3], [0, 2, 3]]]
+
+
 def test_get_game_graph():
     # K2
     V_gg, A_gg = get_game_graph(*K2, k=2)
@@ -226,6 +251,149 @@ def test_get_game_graph():
     assert set(A_gg) == set(d_P2_gg[1])
 
 
+def test_get_compact_game_graph():
+    for graph, k, (V_gg, A_gg) in [(K2, 2, K2_gg2), (K3, 1, K3_gg),
+            (d_P2, 1, d_P2_gg)]:
+        encoder, arcs = get_game_graph(*graph, k=k, compact=True)
+        assert len(encoder) == len(V_gg)
+        assert {encoder.decode(i) for i in range(len(encoder))} == set(V_gg)
+        for v in V_gg:
+            assert encoder.decode(encoder.encode(v)) == v
+        decoded_arcs = {(encoder.decode(u), encoder.decode(v))
+                for u in range(len(encoder))
+                for v in arcs.targets[arcs.offsets[u]:arcs.offsets[u+1]]}
+        assert decoded_arcs == set(A_gg)
+
+
+def test_get_parallel_game_graph():
+    for graph, k in [(K2, 2), (K3, 1), (d_P2, 1), (d_C12, 1)]:
+        for symmetric in [False, True]:
+            _, arcs = get_game_graph(*graph, k=k, compact=True,
+                    symmetric=symmetric)
+            _, parallel_arcs = get_game_graph(*graph, k=k, compact=True,
+                    symmetric=symmetric, workers=2)
+            assert np.array_equal(arcs.offsets, parallel_arcs.offsets)
+            assert np.array_equal(arcs.targets, parallel_arcs.targets)
+    assert is_kcop_win(*d_C12, workers=2, force_reduction=True)
+    assert not is_kcop_win(*C4, workers=2)
+
+
+def test_get_mapped_game_graph():
+    with tempfile.TemporaryDirectory() as directory:
+        for graph, k in [(K2, 2), (d_P2, 1), (d_C12, 1)]:
+            _, arcs = get_game_graph(*graph, k=k, compact=True)
+            _, mapped_arcs = get_game_graph(*graph, k=k, compact=True,
+                    directory=directory)
+            assert isinstance(mapped_arcs.targets, np.memmap)
+            assert np.array_equal(arcs.offsets, mapped_arcs.offsets)
+            assert np.array_equal(arcs.targets, mapped_arcs.targets)
+        # The files of the same game are reused.
+        targets_path = os.path.join(directory, 'targets.npy')
+        modified = os.stat(targets_path).st_mtime_ns
+        get_game_graph(*d_C12, compact=True, directory=directory)
+        assert os.stat(targets_path).st_mtime_ns == modified
+
+        assert is_kcop_win(*d_C12, directory=directory, force_reduction=True)
+        assert os.path.exists(os.path.join(directory,
+                'previous_targets.npy'))
+        assert not is_kcop_win(*C4, directory=directory)
+        assert is_kcop_win(*C4, k=2, engine='vectorized',
+                directory=directory, force_reduction=True)
+        assert is_kcop_win(*d_C12, directory=directory, capture_time=True) \
+                == is_kcop_win(*d_C12, capture_time=True)
+
+
+def test_resume_mapped_game_graph():
+    encoder, arcs = get_game_graph(*d_C12, compact=True)
+    with tempfile.TemporaryDirectory() as directory:
+        get_game_graph(*d_C12, compact=True, directory=directory)
+        # The build is interrupted after the checkpoint of the time step 2.
+        with open(os.path.join(directory, 'game.json')) as file:
+            build = json.load(file)
+        os.remove(os.path.join(directory, 'game.json'))
+        build.update({'time_step': 2,
+                'num_targets': int(arcs.offsets[4 * encoder.num_positions])})
+        with open(os.path.join(directory, 'build.json'), 'w') as file:
+            json.dump(build, file)
+        _, resumed_arcs = get_game_graph(*d_C12, compact=True,
+                directory=directory)
+        assert np.array_equal(arcs.offsets, resumed_arcs.offsets)
+        assert np.array_equal(arcs.targets, resumed_arcs.targets)
+        assert not os.path.exists(os.path.join(directory, 'build.json'))
+
+        # The attractor is resumed from its checkpoint.
+        game = game_graph_to_reachability_game(encoder, resumed_arcs)
+        attractor = reachability_game.get_attractor(*game)
+        reachability_game.get_attractor(*game, directory=directory,
+                checkpoint_interval=0)
+        with np.load(os.path.join(directory, 'attractor.npz')) as checkpoint:
+            assert checkpoint['propagate_stack'].size == 0
+        assert np.array_equal(reachability_game.get_attractor(*game,
+                directory=directory), attractor)
+
+
+def test_get_symmetric_game_graph():
+    # K2, the vertices (2, 1, r, s, t) are identified with (1, 2, r, s, t).
+    V_gg, A_gg = get_game_graph(*K2, k=2, symmetric=True)
+    assert set(V_gg) == {v for v in K2_gg2[0] if v[0] <= v[1]}
+    assert set(A_gg) == {(u, tuple(sorted(v[:2])) + v[2:])
+            for u, v in K2_gg2[1] if u[0] <= u[1]}
+
+    encoder, arcs = get_game_graph(*K2, k=2, compact=True, symmetric=True)
+    assert [encoder.decode(i) for i in range(len(encoder))] == V_gg
+    assert encoder.encode((2, 1, 2, True, 0)) \
+            == encoder.encode((1, 2, 2, True, 0))
+    decoded_arcs = [(encoder.decode(u), encoder.decode(v))
+            for u in range(len(encoder))
+            for v in arcs.targets[arcs.offsets[u]:arcs.offsets[u+1]]]
+    assert sorted(decoded_arcs) == sorted(A_gg)
+
+
+def test_get_quotient_game_graph():
+    # K3, the orbits are the captured and the uncaptured positions.
+    encoder, arcs = get_game_graph(*K3, compact=True, automorphisms=True)
+    assert len(encoder) == 4
+    assert encoder.encode((1, 2, False, 0)) \
+            == encoder.encode((3, 1, False, 0))
+    assert list(encoder.expand_positions(encoder.captured_positions())) \
+            == [v[0] == v[1] for v in K3_gg[0] if not v[2]]
+
+    try:
+        get_game_graph(*K3, automorphisms=True)
+    except ValueError:
+        pass
+    else:
+        assert False, 'ValueError hadn\'t been thrown.'
+
+
+def test_iter_game_graph():
+    for graph, k, (V_gg, A_gg) in [(K2, 2, K2_gg2), (K3, 1, K3_gg),
+            (d_P2, 1, d_P2_gg)]:
+        stream = list(iter_game_graph(*graph, k=k))
+        assert [u for u, _ in stream] == get_game_graph(*graph, k=k)[0]
+        assert {(u, v) for u, successors in stream for v in successors} \
+                == set(A_gg)
+
+
+def test_implicit_game_graph():
+    for graph, k, symmetric in [(K2, 2, False), (K2, 2, True), (K3, 1, False),
+            (d_P2, 1, False)]:
+        game = ImplicitGameGraph(*graph, k=k, symmetric=symmetric)
+        encoder, arcs = get_game_graph(*graph, k=k, compact=True,
+                symmetric=symmetric)
+        assert game.num_vertices == len(encoder)
+        predecessors = [[] for _ in range(len(encoder))]
+        for u in range(len(encoder)):
+            successors = arcs.targets[arcs.offsets[u]:arcs.offsets[u+1]]
+            assert sorted(game.successors(u)) == sorted(successors)
+            assert game.out_degree(u) == len(successors)
+            assert game.is_player0(u) == (not encoder.decode(u)[-2])
+            for v in successors:
+                predecessors[v].append(u)
+        for v in range(len(encoder)):
+            assert sorted(game.predecessors(v)) == sorted(predecessors[v])
+
+
 def test_game_graph_to_reachability_game():
     # K2
     S0, S1, A, F = game_graph_to_reachability_game(*K2_gg2)
@@ -248,11 +416,30 @@ def test_game_graph_to_reachability_game():
     assert set(A) == set(d_P2_rg[2])
     assert set(F) == set(d_P2_rg[3])
 
+    # d_P2, streamed
+    S0, S1, index, F = stream_to_reachability_game(iter_game_graph(*d_P2))
+    assert set(S0) == set(d_P2_rg[0])
+    assert set(S1) == set(d_P2_rg[1])
+    assert {(u, v) for v, previous in index.previous.items()
+            for u in previous} == set(d_P2_rg[2])
+    assert set(F) == set(d_P2_rg[3])
+    assert sum(index.num_out_degree.values()) == len(d_P2_rg[2])
+
+    # d_P2, integer-encoded
+    encoder, arcs = get_game_graph(*d_P2, compact=True)
+    S0, S1, A, F = game_graph_to_reachability_game(encoder, arcs)
+    assert set(map(encoder.decode, S0)) == set(d_P2_rg[0])
+    assert set(map(encoder.decode, S1)) == set(d_P2_rg[1])
+    assert set(map(encoder.decode, F)) == set(d_P2_rg[3])
+    assert A is arcs
+
 
 def test_is_kcop_win():
     # K3
     assert is_kcop_win(*K3)
     assert is_kcop_win(*K3, k=2)
+    assert not is_kcop_win(*K3, k=0)
+    assert not is_kcop_win([1, 2, 3], [(1, 2), (2, 3)], k=0)
 
     # C4
     assert not is_kcop_win(*C4)
@@ -260,3 +447,312 @@ def test_is_kcop_win():
 
     # d_C12
     assert is_kcop_win(*d_C12)
+
+
+def test_is_kcop_win_force_reduction():
+    assert is_kcop_win(*K3, force_reduction=True)
+    assert not is_kcop_win(*C4, force_reduction=True)
+    assert is_kcop_win(*C4, tau={e: '11' for e in C4[1]}) \
+            == is_kcop_win(*C4, tau={e: '11' for e in C4[1]},
+            force_reduction=True)
+
+
+def test_is_kcop_win_components():
+    V = [1, 2, 3, 4, 5, 6, 7]
+    E = [(1, 2), (2, 3), (3, 4), (4, 1), (5, 6), (6, 7)]
+    assert not is_kcop_win(V, E, k=2)
+    assert is_kcop_win(V, E, k=3)
+
+
+def test_prune_unreachable():
+    encoder, arcs = get_game_graph(*d_P2, compact=True)
+    game = game_graph_to_reachability_game(encoder, arcs)
+    (S0, S1, A, F), vertices, num_pruned = prune_unreachable(encoder, *game)
+    assert num_pruned + len(vertices) == len(encoder)
+    # The robber never moves onto a cop, so the cops never have to move from
+    # a vertex where the robber is caught after the first time step.
+    assert encoder.encode((1, 1, False, 1)) not in vertices
+    assert encoder.encode((1, 1, False, 0)) in vertices
+    assert len(S0) + len(S1) == len(vertices)
+    assert set(vertices[F]) <= set(game[3])
+
+
+def test_is_kcop_win_compact():
+    assert is_kcop_win(*K3, compact=True)
+    assert not is_kcop_win(*C4, compact=True)
+    assert is_kcop_win(*C4, k=2, compact=True)
+    assert is_kcop_win(*d_C12, compact=True)
+
+
+def test_is_kcop_win_symmetric():
+    assert is_kcop_win(*K3, k=2, symmetric=True)
+    assert is_kcop_win(*C4, k=2, symmetric=True)
+    assert is_kcop_win(*C4, k=3, symmetric=True, engine='vectorized')
+    assert not is_kcop_win(*C4, symmetric=True, compact=True)
+
+
+def test_is_kcop_win_automorphisms():
+    assert is_kcop_win(*K3, automorphisms=True)
+    assert not is_kcop_win(*C4, automorphisms=True)
+    assert is_kcop_win(*C4, k=2, automorphisms=True, symmetric=True)
+    assert is_kcop_win(*d_C12, automorphisms=True, engine='vectorized')
+    assert is_kcop_win(*d_P2, automorphisms=True) == is_kcop_win(*d_P2)
+
+
+def test_is_kcop_win_implicit():
+    assert is_kcop_win(*K3, engine='implicit', force_reduction=True)
+    assert not is_kcop_win(*C4, engine='implicit', force_reduction=True)
+    assert is_kcop_win(*C4, k=2, engine='implicit', symmetric=True,
+            force_reduction=True)
+    assert is_kcop_win(*d_C12, engine='implicit')
+    assert is_kcop_win(*d_P2, engine='implicit') == is_kcop_win(*d_P2)
+
+
+def test_is_kcop_win_prune():
+    assert is_kcop_win(*K3, prune=True, force_reduction=True)
+    assert not is_kcop_win(*C4, prune=True, force_reduction=True)
+    assert is_kcop_win(*C4, k=2, engine='vectorized', prune=True,
+            force_reduction=True)
+    assert is_kcop_win(*d_C12, prune=True)
+    assert is_kcop_win(*d_P2, prune=True) == is_kcop_win(*d_P2)
+
+
+def test_is_kcop_win_compress():
+    V, E, tau = d_C12
+    tau = {e: edge_pattern * 3 for e, edge_pattern in tau.items()}
+    assert is_kcop_win(V, E, tau, compress=True)
+    assert is_kcop_win(*C4, tau={e: '11' for e in C4[1]}, k=2,
+            compress=True)
+
+
+def test_is_kcop_win_cache():
+    directory = tempfile.TemporaryDirectory()
+    cache = ResultCache(os.path.join(directory.name, 'cache.db'))
+    assert not is_kcop_win(*C4, cache=cache)
+    assert not is_kcop_win([4, 3, 2, 1], [(2, 1), (4, 3), (3, 2), (1, 4)],
+            cache=cache)
+    assert is_kcop_win(*C4, k=2, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+    directory.cleanup()
+
+
+def test_compile_game():
+    clear_compiled_game_cache()
+    V, E = C4
+    tau = {(1, 2): '1', (2, 3): '001', (3, 4): '1', (4, 1): '1'}
+    game = compile_game(V, E, tau, 1)
+    assert game.kcop_win
+    assert game.winning_starts() == [(1,), (2,), (3,), (4,)]
+    assert game.get_next_winning_moves((1, 3, False, 0)) == [
+            (1, 3, True, 0), (2, 3, True, 0), (4, 3, True, 0)]
+    assert game.get_next_winning_moves((4, 3, True, 0)) == []
+    assert game.is_winning((4, 3, True, 0))
+
+    # The edges reoriented give the same game.
+    assert compile_game(V, [(2, 1), (2, 3), (3, 4), (4, 1)],
+            {(2, 1): '1', (2, 3): '001', (3, 4): '1', (4, 1): '1'},
+            1) is game
+    assert is_kcop_win(V, E, tau, 1, compiled=True)
+    info = get_compiled_game_cache_info()
+    assert (info.hits, info.misses, info.num_games) == (2, 1, 1)
+    assert info.nbytes == game.nbytes
+
+    # A miss of the result cache is solved by a compiled game.
+    directory = tempfile.TemporaryDirectory()
+    cache = ResultCache(os.path.join(directory.name, 'cache.db'))
+    assert is_kcop_win(V, E, tau, 1, cache=cache, compiled=True)
+    info = get_compiled_game_cache_info()
+    assert (info.hits, info.misses, cache.misses) == (3, 1, 1)
+    cache.close()
+    directory.cleanup()
+
+    assert not compile_game(*C4, k=1).kcop_win
+    set_compiled_game_cache_limit(game.nbytes)
+    info = get_compiled_game_cache_info()
+    assert info.num_games == 1 and info.evictions == 1
+    set_compiled_game_cache_limit(MAX_COMPILED_GAMES_BYTES)
+
+
+def test_update_compiled_game():
+    V, E = C4
+    tau = {(1, 2): '1', (2, 3): '01', (3, 4): '1', (4, 1): '1'}
+    game = CompiledGame(V, E, tau, 1)
+    for edge, edge_pattern, new_tau in [
+            ((3, 2), '001', {(1, 2): '1', (2, 3): '001', (3, 4): '1',
+            (4, 1): '1'}),
+            ((2, 3), '10', {(1, 2): '1', (2, 3): '10', (3, 4): '1',
+            (4, 1): '1'}),
+            ((2, 3), '1', {(1, 2): '1', (2, 3): '1', (3, 4): '1',
+            (4, 1): '1'}),
+            ((2, 3), None, {(1, 2): '1', (3, 4): '1', (4, 1): '1'}),
+            ((1, 3), '1', {(1, 2): '1', (2, 3): '01', (3, 4): '1',
+            (4, 1): '1', (1, 3): '1'})]:
+        updated_game, num_touched = game.update(edge, edge_pattern)
+        assert 0 < num_touched <= updated_game.encoder.num_states
+        assert updated_game.kcop_win == is_kcop_win(V, list(new_tau),
+                new_tau, 1)
+        fresh_game = CompiledGame(V, list(new_tau), new_tau, 1)
+        assert updated_game.capture_time == fresh_game.capture_time
+        assert updated_game.fingerprint == fresh_game.fingerprint
+        if updated_game.encoder.time_horizon \
+                == fresh_game.encoder.time_horizon:
+            assert np.array_equal(updated_game.ranks, fresh_game.ranks)
+    # The game is not modified.
+    assert game.kcop_win == is_kcop_win(V, E, tau, 1)
+    assert game.tau[(2, 3)] == '01'
+    assert game.update((2, 3), '0101') == (game, 0)
+
+
+def test_load_game():
+    V, E = C4
+    tau = {(1, 2): '1', (2, 3): '001', (3, 4): '1', (4, 1): '1'}
+    game = CompiledGame(V, E, tau, 1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'C4.game')
+        game.save(path)
+        loaded_game = load_game(path, get_fingerprint(V, E, tau, 1))
+        assert isinstance(loaded_game.arcs.targets, np.memmap)
+        assert np.array_equal(loaded_game.ranks, game.ranks)
+        assert loaded_game.kcop_win and loaded_game.capture_time == \
+                game.capture_time
+        assert loaded_game.winning_starts() == game.winning_starts()
+        assert loaded_game.get_fastest_moves((1, 3, False, 0)) \
+                == game.get_fastest_moves((1, 3, False, 0))
+
+        try:
+            load_game(path, get_fingerprint(*C4, k=1))
+        except ValueError:
+            pass
+        else:
+            assert False, 'ValueError hadn\'t been thrown.'
+        with open(path, 'wb') as file:
+            file.write(b'{}')
+        try:
+            load_game(path)
+        except ValueError:
+            pass
+        else:
+            assert False, 'ValueError hadn\'t been thrown.'
+
+        # The tuples in V are loaded back as tuples.
+        V = [(i, j) for i in range(2) for j in range(3)]
+        E = [((i, j), (i, j+1)) for i in range(2) for j in range(2)] \
+                + [((0, j), (1, j)) for j in range(3)]
+        tau = {((0, 1), (1, 1)): '01'}
+        game = CompiledGame(V, E, tau, 1)
+        path = os.path.join(directory, 'grid.game')
+        game.save(path)
+        loaded_game = load_game(path, get_fingerprint(V, E, tau, 1))
+        assert loaded_game.encoder.V == V
+        assert loaded_game.tau == game.tau
+        assert loaded_game.kcop_win == game.kcop_win
+        assert loaded_game.winning_starts() == game.winning_starts()
+        updated_game, _ = loaded_game.update(((0, 1), (1, 1)), '1')
+        assert updated_game.kcop_win == is_kcop_win(V, E, None, 1)
+
+        path = os.path.join(directory, 'sets.game')
+        V = [frozenset({1}), frozenset({2})]
+        game = CompiledGame(V, [tuple(V)], None, 1)
+        try:
+            game.save(path)
+        except ValueError:
+            pass
+        else:
+            assert False, 'ValueError hadn\'t been thrown.'
+        assert not os.path.exists(path + '.tmp')
+    clear_compiled_game_cache()
+
+
+def test_is_kcop_win_capture_time():
+    assert is_kcop_win(*C4, k=2, capture_time=True) == (True, 1)
+    assert is_kcop_win(*C4, k=1, capture_time=True) == (False, None)
+    V = list(range(5))
+    E = [(i, i+1) for i in range(4)]
+    assert is_kcop_win(V, E, capture_time=True) == (True, 2)
+    assert is_kcop_win(V, E, capture_time=True, symmetric=True,
+            automorphisms=True, prune=True) == (True, 2)
+    assert is_kcop_win(V, E, capture_time=True, compiled=True) == (True, 2)
+
+    game = compile_game(V, E)
+    assert game.capture_time == 2
+    assert game.get_fastest_moves((2, 0, False, 0)) == [(1, 0, True, 0)]
+    assert game.get_fastest_moves((1, 0, True, 0)) == [(1, 0, False, 0)]
+    clear_compiled_game_cache()
+
+
+def test_is_kcop_win_max_rounds():
+    V = list(range(5))
+    E = [(i, i+1) for i in range(4)]
+    assert not is_kcop_win(V, E, max_rounds=1)
+    assert is_kcop_win(V, E, max_rounds=2)
+    assert is_kcop_win(V, E, max_rounds=2, capture_time=True) == (True, 2)
+    assert not is_kcop_win(V, E, max_rounds=1, prune=True, symmetric=True)
+    assert is_kcop_win(V, E, max_rounds=2, compiled=True)
+    assert not is_kcop_win(V, E, max_rounds=1, compiled=True)
+    assert not is_kcop_win(*C4, k=1, max_rounds=10)
+    clear_compiled_game_cache()
+
+
+def test_is_kcop_win_stream():
+    assert is_kcop_win(*K3, engine='stream', force_reduction=True)
+    assert not is_kcop_win(*C4, engine='stream', force_reduction=True)
+    assert is_kcop_win(*C4, k=2, engine='stream', symmetric=True,
+            force_reduction=True)
+    assert is_kcop_win(*d_C12, engine='stream')
+
+
+def test_is_kcop_win_vectorized():
+    assert is_kcop_win(*K3, engine='vectorized')
+    assert not is_kcop_win(*C4, engine='vectorized')
+    assert is_kcop_win(*C4, k=2, engine='vectorized')
+    assert is_kcop_win(*d_C12, engine='vectorized')
+    assert is_kcop_win(*d_P2) == is_kcop_win(*d_P2, engine='vectorized')
+
+
+def test_is_kcop_win_parallel():
+    assert not is_kcop_win(*C4, engine='parallel', workers=2)
+    assert is_kcop_win(*C4, k=2, engine='parallel', workers=2,
+            force_reduction=True)
+    assert is_kcop_win(*d_C12, engine='parallel', workers=2,
+            force_reduction=True)
+    assert is_kcop_win(*d_P2, force_reduction=True) \
+            == is_kcop_win(*d_P2, engine='parallel', force_reduction=True)
+
+
+def test_get_bitset_winning_sets():
+    V = list(range(5))
+    E = [(i, i+1) for i in range(4)]
+    encoder, winning, rounds = get_bitset_winning_sets(V, E)
+    assert rounds == 2
+    # The cop in the middle wins wherever the robber is.
+    assert winning[0][encoder.cop_configuration_index((2,))] == 0b11111
+    assert winning[0][encoder.cop_configuration_index((0,))] == 0b00011
+    assert get_bitset_winning_sets(V, E, max_rounds=1)[2] is None
+    assert get_bitset_winning_sets(*C4)[2] is None
+
+
+def test_is_kcop_win_bitset():
+    for force_reduction in [False, True]:
+        assert is_kcop_win(*K3, engine='bitset',
+                force_reduction=force_reduction)
+        assert not is_kcop_win(*C4, engine='bitset',
+                force_reduction=force_reduction)
+        assert is_kcop_win(*C4, k=2, engine='bitset', symmetric=True,
+                force_reduction=force_reduction)
+        assert is_kcop_win(*d_C12, engine='bitset',
+                force_reduction=force_reduction)
+        assert is_kcop_win(*d_P2, engine='bitset',
+                force_reduction=force_reduction) == is_kcop_win(*d_P2)
+    assert is_kcop_win(*C4, k=2, engine='bitset', capture_time=True) \
+            == (True, 1)
+    assert not is_kcop_win(*d_C12, engine='bitset', max_rounds=1)
+
+
+def test_cop_number():
+    assert cop_number(*K3) == 1
+    assert cop_number(*C4) == 2
+    assert cop_number(*C4, max_k=1) is None
+    assert cop_number(*d_C12) == 1
+    assert cop_number([1, 2, 3, 4], [(1, 2), (3, 4)]) == 2
+    assert cop_number([], []) == 0
@@ -1,7 +1,8 @@
 import ggames
 import sys, os, io
-import tempfile
+import tempfile, subprocess
 import errno
+import json
 
 
 PATH_TO_GRAPH_JSON = 'tests/tests_graph_json'
@@ -154,6 +155,136 @@ def test_kcop_win():
         sys.stdout = sys.__stdout__
 
 
+def test_kcop_win_cop_number():
+    try:
+        output = io.StringIO()
+        sys.stdout = output
+        ggames.kcop_win([os.path.join(PATH_TO_GRAPH_JSON, 'cycle5.json'),
+                '--cop-number'])
+    except SystemExit as ex:
+        assert ex.code == 0
+        assert output.getvalue() == '2\n'
+    else:
+        assert False, 'The console script didn\'t exit.'
+    finally:
+        sys.stdout = sys.__stdout__
+
+    try:
+        output = io.StringIO()
+        sys.stdout = output
+        ggames.kcop_win(['1', os.path.join(PATH_TO_GRAPH_JSON, 'cycle5.json'),
+                '--cop-number'])
+    except SystemExit as ex:
+        assert ex.code == 0
+        assert output.getvalue() == 'None\n'
+    finally:
+        sys.stdout = sys.__stdout__
+
+
+def test_kcop_win_max_rounds():
+    for max_rounds, expected in [('1', 'False\n'), ('2', 'True\n')]:
+        try:
+            output = io.StringIO()
+            sys.stdout = output
+            ggames.kcop_win(['1', os.path.join(PATH_TO_GRAPH_JSON,
+                    'path4.json'), '--max-rounds', max_rounds])
+        except SystemExit as ex:
+            assert ex.code == 0
+            assert output.getvalue() == expected
+        else:
+            assert False, 'The console script didn\'t exit.'
+        finally:
+            sys.stdout = sys.__stdout__
+
+
+def test_kcop_win_work_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        # The second run reuses the game graph of the first one.
+        for _ in range(2):
+            try:
+                output = io.StringIO()
+                sys.stdout = output
+                ggames.kcop_win(['1', os.path.join(PATH_TO_GRAPH_JSON,
+                        'd_tree.json'), '--work-dir', directory])
+            except SystemExit as ex:
+                assert ex.code == 0
+                assert output.getvalue() == 'True\n'
+            else:
+                assert False, 'The console script didn\'t exit.'
+            finally:
+                sys.stdout = sys.__stdout__
+        assert os.path.exists(os.path.join(directory, 'game.json'))
+
+        # The job of the directory is run again from its files.
+        try:
+            output = io.StringIO()
+            sys.stdout = output
+            ggames.kcop_win(['--resume', directory])
+        except SystemExit as ex:
+            assert ex.code == 0
+            assert output.getvalue() == 'True\n'
+        else:
+            assert False, 'The console script didn\'t exit.'
+        finally:
+            sys.stdout = sys.__stdout__
+
+
+def test_kcop_win_batch():
+    try:
+        output = io.StringIO()
+        sys.stdout = output
+        temp_jsonl = tempfile.NamedTemporaryFile('w+', suffix='.jsonl',
+                delete=False)
+        # The last graph is nested too deeply to be read by the JSon
+        # parser, which raises a RecursionError.
+        temp_jsonl.write('{"V": [1, 2], "E": [[1, 2]]}\n\n'\
+                '{"V": [1], "E": [[1, 3]]}\n' + '[' * 10**6 + ']' * 10**6
+                + '\n')
+        temp_jsonl.close()
+        ggames.kcop_win(['1', '--batch', PATH_TO_GRAPH_JSON,
+                temp_jsonl.name, 'a_wrong_path_to_the_json_dir/graph.json',
+                '--workers', '2'])
+    except SystemExit as ex:
+        assert ex.code == 0
+        results = [json.loads(line) for line in
+                output.getvalue().splitlines()]
+        results = {result['name']: result for result in results}
+        assert len(results) == 13
+        assert results[os.path.join(PATH_TO_GRAPH_JSON,
+                'cycle5.json')]['result'] is False
+        assert results[os.path.join(PATH_TO_GRAPH_JSON,
+                'd_tree.json')]['result'] is True
+        assert results[os.path.join(PATH_TO_GRAPH_JSON,
+                'error_unexpected_vertex_d_cycle5.json')]['error'] == \
+                'Unexpected value detected in \'E\' variable.'
+        assert results[f'{temp_jsonl.name}:1']['result'] is True
+        assert 'error' in results[f'{temp_jsonl.name}:3']
+        assert results[f'{temp_jsonl.name}:4']['error'] \
+                .startswith('RecursionError')
+        assert 'error' in results['a_wrong_path_to_the_json_dir/graph.json']
+    else:
+        assert False, 'The console script didn\'t exit.'
+    finally:
+        sys.stdout = sys.__stdout__
+        os.unlink(temp_jsonl.name)
+
+    # The logs of a batch and of its workers go to the standard error, so the
+    # standard output holds only JSon lines.
+    with tempfile.TemporaryDirectory() as directory:
+        completed = subprocess.run([sys.executable, '-c',
+                'import sys, ggames; ggames.kcop_win(sys.argv[1:])', '1',
+                '--batch', os.path.join(PATH_TO_GRAPH_JSON, 'd_tree.json'),
+                os.path.join(PATH_TO_GRAPH_JSON, 'cycle5.json'),
+                '--cache', os.path.join(directory, 'cache.sqlite'),
+                '--workers', '2', '--verbose'], capture_output=True,
+                text=True)
+    assert completed.returncode == 0
+    assert len([json.loads(line)
+            for line in completed.stdout.splitlines()]) == 2
+    assert '"cops_robbers_game.is_kcop_win" called.' in completed.stderr
+    assert 'Cache: 0 hits, 2 misses.' in completed.stderr
+
+
 def test_error_kcop_win():
     try:
         output = io.StringIO()
@@ -181,6 +312,18 @@ def test_error_kcop_win():
                 'No such file or directory'
     finally:
         sys.stderr = sys.__stderr__
+
+    try:
+        output = io.StringIO()
+        sys.stderr = output
+        ggames.kcop_win(['--resume', 'a_wrong_path_to_the_work_dir'])
+    except SystemExit as ex:
+        assert ex.code == errno.ENOENT # No such file or directory
+        assert output.getvalue() == 'The job cannot be resumed. Check if the '\
+                'directory was given to --work-dir\nby a previous run.\n'\
+                'No such file or directory'
+    finally:
+        sys.stderr = sys.__stderr__
     
     try:
         output = io.StringIO()
@@ -1,4 +1,6 @@
 from ggames.reachability_game import *
+import os, tempfile
+import numpy as np
 
 
 S0 = [1, 2]
@@ -23,6 +25,14 @@ F = [5]
 reachability_game3 = S0, S1, A, F
 attractor3 = [4, 5]
 
+S0 = [1, 4]
+S1 = [0, 2, 3, 5]
+A = [(4, 4), (0, 1), (4, 0), (0, 4), (3, 4), (2, 1), (4, 3), (3, 1), (2, 0),
+        (1, 4), (4, 2), (2, 3), (3, 0), (3, 3), (2, 2), (3, 2), (5, 2)]
+F = [1, 2, 4, 5]
+reachability_game4 = S0, S1, A, F
+attractor4 = [0, 1, 2, 4, 5]
+
 
 def test_get_attractor():
     attractor = get_attractor(*reachability_game1)
@@ -34,6 +44,178 @@ def test_get_attractor():
     attractor = get_attractor(*reachability_game3)
     assert set(attractor) == set(attractor3)
 
+    attractor = get_attractor(*reachability_game4)
+    assert set(attractor) == set(attractor4)
+
+
+def test_get_attractor_predecessor_index():
+    for game, expected in [(reachability_game1, attractor1),
+            (reachability_game2, attractor2),
+            (reachability_game3, attractor3),
+            (reachability_game4, attractor4)]:
+        S0, S1, A, F = game
+        previous = dict()
+        num_out_degree = {v: 0 for v in S0 + S1}
+        for u, v in A:
+            previous.setdefault(v, []).append(u)
+            num_out_degree[u] += 1
+        index = PredecessorIndex(previous, num_out_degree)
+        attractor = get_attractor(S0, S1, index, F)
+        assert set(attractor) == set(expected)
+        # The index can be used again.
+        assert set(get_attractor(S0, S1, index, F)) == set(expected)
+
+
+def _to_compact(S0, S1, A, F):
+    index = {v: i for i, v in enumerate(S0 + S1)}
+    successors = [[] for _ in index]
+    for u, v in A:
+        successors[index[u]].append(index[v])
+    offsets = np.cumsum([0] + list(map(len, successors)))
+    targets = np.array([v for vs in successors for v in vs], dtype=np.int64)
+    return (np.arange(len(S0)), np.arange(len(S0), len(index)),
+            CSRArcs(offsets, targets), np.array([index[v] for v in F])), \
+            S0 + S1
+
+
+def test_get_compact_attractor():
+    for game, expected in [(reachability_game1, attractor1),
+            (reachability_game2, attractor2),
+            (reachability_game3, attractor3),
+            (reachability_game4, attractor4)]:
+        compact_game, vertices = _to_compact(*game)
+        attractor = get_attractor(*compact_game)
+        assert {vertices[i] for i in attractor} == set(expected)
+
+
+def test_get_vectorized_attractor():
+    for game, expected in [(reachability_game1, attractor1),
+            (reachability_game2, attractor2),
+            (reachability_game3, attractor3),
+            (reachability_game4, attractor4)]:
+        compact_game, vertices = _to_compact(*game)
+        in_attractor = get_vectorized_attractor(*compact_game)
+        assert in_attractor.dtype == bool
+        assert {vertices[i] for i in np.flatnonzero(in_attractor)} \
+                == set(expected)
+
+
+def test_get_parallel_attractor():
+    for game, expected in [(reachability_game1, attractor1),
+            (reachability_game2, attractor2),
+            (reachability_game3, attractor3),
+            (reachability_game4, attractor4)]:
+        compact_game, vertices = _to_compact(*game)
+        for workers in [1, 3]:
+            attractor = get_parallel_attractor(*compact_game, workers=workers)
+            assert np.array_equal(attractor, get_attractor(*compact_game))
+            assert {vertices[i] for i in attractor} == set(expected)
+
+
+def test_get_mapped_predecessors():
+    compact_game, _ = _to_compact(*reachability_game2)
+    previous = get_predecessors(compact_game[2])
+    with tempfile.TemporaryDirectory() as directory:
+        mapped_previous = get_predecessors(compact_game[2], directory)
+        assert isinstance(mapped_previous.targets, np.memmap)
+        assert np.array_equal(previous.offsets, mapped_previous.offsets)
+        assert np.array_equal(previous.targets, mapped_previous.targets)
+        assert np.array_equal(get_attractor(*compact_game,
+                previous=mapped_previous), get_attractor(*compact_game))
+
+    with tempfile.TemporaryDirectory() as directory:
+        # A run interrupted while filling the files leaves only temporary
+        # files, which are not reused.
+        for name, values in [('previous_offsets', previous.offsets),
+                ('previous_targets', previous.targets)]:
+            np.lib.format.open_memmap(os.path.join(directory,
+                    name + '.npy.tmp'), mode='w+', dtype=values.dtype,
+                    shape=values.shape).flush()
+        os.replace(os.path.join(directory, 'previous_targets.npy.tmp'),
+                os.path.join(directory, 'previous_targets.npy'))
+        mapped_previous = get_predecessors(compact_game[2], directory)
+        assert np.array_equal(previous.offsets, mapped_previous.offsets)
+        assert np.array_equal(previous.targets, mapped_previous.targets)
+        assert not os.path.exists(os.path.join(directory,
+                'previous_offsets.npy.tmp'))
+
+
+def test_iter_attractor_levels():
+    compact_game, vertices = _to_compact(*reachability_game2)
+    levels = [{vertices[i] for i in level} for level in
+            iter_attractor_levels(compact_game[0], compact_game[2],
+            compact_game[3])]
+    assert levels == [{10}, {8, 9}, {5, 6, 7}, {1, 2, 3, 4}]
+
+
+def test_get_attractor_ranks():
+    assert get_attractor_ranks(*reachability_game1) == {5: 0, 2: 1}
+    assert get_attractor_ranks(*reachability_game2) == {10: 0, 8: 1, 9: 1,
+            5: 2, 6: 2, 7: 2, 1: 3, 2: 3, 3: 3, 4: 3}
+    assert get_attractor_ranks(*reachability_game3) == {5: 0, 4: 1}
+    for game, expected in [(reachability_game1, attractor1),
+            (reachability_game2, attractor2),
+            (reachability_game3, attractor3),
+            (reachability_game4, attractor4)]:
+        ranks = get_attractor_ranks(*game)
+        assert set(ranks) == set(expected)
+        compact_game, vertices = _to_compact(*game)
+        compact_ranks = get_attractor_ranks(*compact_game)
+        assert {vertices[i]: rank for i, rank in enumerate(compact_ranks)
+                if rank >= 0} == ranks
+
+
+def test_get_reachable():
+    compact_game, vertices = _to_compact(*reachability_game3)
+    reachable = get_reachable(compact_game[2],
+            np.array([vertices.index(4)]))
+    assert {vertices[i] for i in np.flatnonzero(reachable)} == {4, 5}
+    reachable = get_reachable(compact_game[2],
+            np.array([vertices.index(1)]))
+    assert reachable.all()
+
+
+def test_get_subgame():
+    compact_game, vertices = _to_compact(*reachability_game1)
+    kept = get_reachable(compact_game[2], np.array([vertices.index(2)]))
+    (S0, S1, A, F), kept_vertices = get_subgame(*compact_game, kept)
+    assert [vertices[i] for i in kept_vertices] == [2, 5]
+    assert list(S0) == [0] and list(S1) == [1] and list(F) == [1]
+    assert list(A.offsets) == [0, 1, 1] and list(A.targets) == [1]
+
+
+class _ImplicitGame:
+    def __init__(self, S0, S1, A, F):
+        compact_game, self.vertices = _to_compact(S0, S1, A, F)
+        S0, S1, self.A, self.F = compact_game
+        self.num_vertices = len(self.vertices)
+        self.S0_set = set(S0.tolist())
+        self.previous = get_predecessors(self.A)
+
+    def targets(self):
+        return self.F
+
+    def is_player0(self, v):
+        return v in self.S0_set
+
+    def out_degree(self, v):
+        return self.A.offsets[v+1] - self.A.offsets[v]
+
+    def predecessors(self, v):
+        return self.previous.targets[
+                self.previous.offsets[v]:self.previous.offsets[v+1]].tolist()
+
+
+def test_get_implicit_attractor():
+    for game, expected in [(reachability_game1, attractor1),
+            (reachability_game2, attractor2),
+            (reachability_game3, attractor3),
+            (reachability_game4, attractor4)]:
+        implicit_game = _ImplicitGame(*game)
+        in_attractor = get_implicit_attractor(implicit_game)
+        assert {implicit_game.vertices[i]
+                for i in np.flatnonzero(in_attractor)} == set(expected)
+
 
 def test_get_next_winning_moves():
     next_moves_for_p0 = get_next_winning_moves(2, reachability_game1[2],
@@ -59,3 +241,46 @@ def test_get_next_winning_moves():
     next_moves_for_p1 = get_next_winning_moves(2, reachability_game3[2],
             attractor3, False)
     assert set(next_moves_for_p1) == {1}
+
+
+def test_strategy():
+    for game, attractor in [(reachability_game1, attractor1),
+            (reachability_game2, attractor2),
+            (reachability_game3, attractor3),
+            (reachability_game4, attractor4)]:
+        S0, S1, A, F = game
+        strategy = Strategy(S0, S1, A, attractor, F)
+        compact_game, vertices = _to_compact(*game)
+        compact_attractor = get_attractor(*compact_game)
+        compact_strategy = Strategy(*compact_game[:3], compact_attractor,
+                compact_game[3])
+        for i, u in enumerate(vertices):
+            for player0_move in [True, False]:
+                expected = set(get_next_winning_moves(u, A, attractor,
+                        player0_move))
+                assert set(strategy.get_next_winning_moves(u,
+                        player0_move)) == expected
+                assert {vertices[j] for j in compact_strategy
+                        .get_next_winning_moves(i, player0_move)} == expected
+            assert set(strategy.get_next_winning_moves(u)) == set(
+                    get_next_winning_moves(u, A, attractor, u in S0))
+
+    strategy = Strategy(*reachability_game2[:3], attractor2,
+            reachability_game2[3])
+    assert strategy.play(1) == [1, 5, 8, 10]
+    assert strategy.play(2, choose=lambda u, moves: moves[-1]) \
+            == [2, 6, 9, 10]
+    # The player 1 escapes from 3 to 1 and 2 forever.
+    strategy = Strategy(*reachability_game3[:3], attractor3,
+            reachability_game3[3])
+    assert strategy.play(2, max_length=4) == [2, 1, 3, 1, 3]
+
+    # With the ranks, the player 0 brings the token to F the fastest, and
+    # the player 1 delays it the most.
+    S0, S1, A, F = reachability_game2
+    A = A + [(1, 6), (6, 1)]
+    ranks = get_attractor_ranks(S0, S1, A, F)
+    strategy = Strategy(S0, S1, A, list(ranks), F, ranks)
+    assert strategy.get_fastest_moves(1) == [5]
+    assert strategy.get_fastest_moves(6) == [1]
+    assert strategy.play(6) == [6, 1, 5, 8, 10]
@@ -0,0 +1,95 @@
+from ggames.structural import *
+
+
+# C4
+V = [1, 2, 3, 4]
+E = [(1, 2), (2, 3), (3, 4), (4, 1)]
+C4 = V, E
+
+# C4 with a chord.
+V = [1, 2, 3, 4]
+E = [(1, 2), (2, 3), (3, 4), (4, 1), (1, 3)]
+C4_chord = V, E
+
+# Tree
+V = [1, 2, 3, 4, 5, 6, 7]
+E = [(1, 2), (2, 3), (3, 4), (2, 5), (5, 6), (3, 7)]
+tree = V, E
+
+# Two disjoint edges
+V = [1, 2, 3, 4]
+E = [(1, 2), (3, 4)]
+two_K2 = V, E
+
+
+def test_is_static():
+    assert is_static(C4[1])
+    assert is_static(C4[1], {e: '11' for e in C4[1]})
+    assert is_static(C4[1], {(1, 2): '1', (2, 3): '0', (3, 4): '1',
+            (4, 1): '1'})
+    assert not is_static(C4[1], {(1, 2): '10', (2, 3): '1', (3, 4): '1',
+            (4, 1): '1'})
+
+
+def test_get_static_edges():
+    assert get_static_edges(C4[1]) == C4[1]
+    assert get_static_edges(C4[1], {(1, 2): '11', (2, 3): '0', (3, 4): '1',
+            (4, 1): '1'}) == [(1, 2), (3, 4), (4, 1)]
+
+
+def test_get_closed_neighbourhoods():
+    assert get_closed_neighbourhoods(*C4) == [0b1011, 0b0111, 0b1110, 0b1101]
+
+
+def test_is_dismantlable():
+    assert not is_dismantlable(*C4)
+    assert is_dismantlable(*C4_chord)
+    assert is_dismantlable(*tree)
+    assert not is_dismantlable(*two_K2)
+    assert is_dismantlable([1], [])
+
+
+def test_get_components():
+    assert get_components(*C4) == [0b1111]
+    assert get_components(*two_K2) == [0b0011, 0b1100]
+
+
+def test_has_dominating_set():
+    assert not has_dominating_set(*C4, 1)
+    assert has_dominating_set(*C4, 2)
+    assert has_dominating_set(*C4_chord, 1)
+
+
+def test_get_greedy_dominating_set():
+    assert get_greedy_dominating_set(*C4_chord) == [1]
+    assert len(get_greedy_dominating_set(*C4)) == 2
+    assert len(get_greedy_dominating_set(*two_K2)) == 2
+
+
+def test_decide():
+    def solve(V, E, k):
+        assert len(V) == 2
+        return True
+
+    assert decide(*C4, None, 4, solve) == (True, 'enough_cops')
+    assert decide(*C4, {e: '10' for e in C4[1]}, 2, solve) is None
+    assert decide(*C4, None, 1, solve) == (False, 'dismantlable')
+    assert decide(*C4, None, 2, solve) == (True, 'dominating_set')
+    assert decide(*C4_chord, None, 1, solve) == (True, 'dismantlable')
+    assert decide(*tree, None, 1, solve) == (True, 'tree')
+    assert decide([1, 2, 3], [(1, 2), (2, 3), (3, 1)], None, 1, solve) \
+            == (True, 'complete')
+    assert decide(*two_K2, None, 1, solve) == (False, 'components')
+    assert decide(*two_K2, None, 2, solve) == (True, 'components')
+    assert decide(*tree, None, 0, solve) == (False, 'no_cops')
+    assert decide([1, 2, 3], [(1, 2), (2, 3), (3, 1)], None, 0, solve) \
+            == (False, 'no_cops')
+    assert decide([1], [], None, 0, solve) == (False, 'no_cops')
+
+
+def test_get_primitive_pattern():
+    assert get_primitive_pattern('1010') == '10'
+    assert get_primitive_pattern('111') == '1'
+    assert get_primitive_pattern('0001') == '0001'
+    assert get_primitive_pattern('10101') == '10101'
+    assert get_primitive_pattern('011011') == '011'